@@ -45,25 +45,28 @@ class PolygonAPIHandlerHistorical:
         self.status_callback = status_callback
         self._log_status_message("PolygonAPIHandlerHistorical instance created.")
 
-    def _log_status_message(self, message_text: str, level: str = "INFO", **kwargs: Any) -> None:
-        log_level_upper = level.upper()
-        if log_level_upper == "ERROR": logger.error(message_text)
-        elif log_level_upper == "WARNING": logger.warning(message_text)
-        else: logger.info(message_text)
+    def _log_status_message(self, message_fmt: str, *args: Any, level: str = "INFO", **kwargs: Any) -> None:
+        # %-style args are interpolated lazily by the logger; the callback payload is only built when needed.
+        log_level = logging.getLevelName(level.upper())
+        if not isinstance(log_level, int):
+            log_level = logging.INFO
+        exc_info = kwargs.pop("exc_info", False)
+        logger.log(log_level, message_fmt, *args, exc_info=exc_info)
         if self.status_callback:
             try:
+                message_text = message_fmt % args if args else message_fmt
                 payload = {"type": level.lower(), "module": "PolygonHandler", "message": message_text}
                 payload.update(kwargs)
                 self.status_callback(payload)
             except Exception as e_cb:
-                logger.error(f"Error occurred in Polygon status_callback: {e_cb}", exc_info=True)
+                logger.error("Error occurred in Polygon status_callback: %s", e_cb, exc_info=True)
 
     async def get_historical_stock_bars(self, ticker: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
         if not self.api_key:
             self._log_status_message("Cannot fetch stock bars: Polygon API key not set.", level="ERROR")
             return None
 
-        self._log_status_message(f"Fetching Polygon stock data for {ticker} from {start_date} to {end_date}...")
+        self._log_status_message("Fetching Polygon stock data for %s from %s to %s...", ticker, start_date, end_date)
         try:
             async with AsyncRESTClient(self.api_key) as client:
                 resp: List[Agg] = await client.get_aggs(
@@ -71,7 +74,7 @@ class PolygonAPIHandlerHistorical:
                     from_=start_date, to=end_date, limit=50000,
                 )
                 if not resp:
-                    self._log_status_message(f"No data returned by Polygon for {ticker}.", level="WARNING")
+                    self._log_status_message("No data returned by Polygon for %s.", ticker, level="WARNING")
                     return None
 
                 df = pd.DataFrame([vars(agg) for agg in resp])
@@ -79,13 +82,13 @@ class PolygonAPIHandlerHistorical:
                 df = df.set_index('date') # type: ignore
                 df = df[['open', 'high', 'low', 'close', 'volume']]
                 
-                self._log_status_message(f"Successfully fetched {len(df)} bars for {ticker}.")
+                self._log_status_message("Successfully fetched %d bars for %s.", len(df), ticker)
                 return df
 
         except NoResultsError:
-            self._log_status_message(f"No data found by Polygon for {ticker} in the specified range.", level="WARNING")
+            self._log_status_message("No data found by Polygon for %s in the specified range.", ticker, level="WARNING")
             return None
         except Exception as e:
-            self._log_status_message(f"An unexpected error occurred fetching data for {ticker}: {e}", exc_info=True)
+            self._log_status_message("An unexpected error occurred fetching data for %s: %s", ticker, e, level="ERROR", exc_info=True)
             return None
         
@@ -6,19 +6,48 @@ class-based and asynchronous approach for maximum performance.
 """
 
 import asyncio
+import functools
+import json
+import logging
 import os
-import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import yfinance as yf
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, GoodFriday, Holiday, USLaborDay, USMartinLutherKingJr,
+    USMemorialDay, USPresidentsDay, USThanksgivingDay, nearest_workday, sunday_to_monday,
+)
+from pandas.tseries.offsets import CustomBusinessDay
 
-from utils.logging_config import get_logger
-
-logger = get_logger(__name__)
+logger = logging.getLogger(__name__)
 
 CACHE_DIR = "data/cache"
 CACHE_START_DATE = "2000-01-01"
+DATE_COLUMN = "Date"
+
+
+class _USExchangeHolidayCalendar(AbstractHolidayCalendar):
+    """Regular full-day NYSE holidays, used to tell a stale cache from a closed market."""
+    rules = [
+        # NYSE moves a Sunday New Year's Day to Monday but stays open on the Friday before a Saturday one
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-06-19", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+_TRADING_DAY = CustomBusinessDay(calendar=_USExchangeHolidayCalendar())
 
 
 class YFinanceHandler:
@@ -27,11 +56,35 @@ class YFinanceHandler:
     Optimized for handling multiple tickers efficiently and asynchronously.
     """
 
-    def __init__(self, cache_dir: str = CACHE_DIR):
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
         self.cache_dir = cache_dir
+        self.status_callback = status_callback
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
         self.semaphore = asyncio.Semaphore(5)  # Allow a few concurrent info lookups
+        # Shared by all download tasks so concurrent fetches are actually rate-limited
+        self.download_semaphore = asyncio.Semaphore(4)
+
+    def _report_progress(self, stage: str, ticker: str, current: int, total: int) -> None:
+        """Sends a progress update to the status callback, if one is attached."""
+        if not self.status_callback:
+            return
+        try:
+            self.status_callback({
+                "type": "info",
+                "module": "YFinanceHandler",
+                "message": f"{stage} {current}/{total}: {ticker}",
+                "stage": stage,
+                "ticker": ticker,
+                "current": current,
+                "total": total,
+            })
+        except Exception as e_cb:
+            logger.error("Error occurred in YFinance status_callback: %s", e_cb, exc_info=True)
 
     async def get_ticker_info(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
@@ -50,52 +103,170 @@ class YFinanceHandler:
                 info_dict = await asyncio.to_thread(getattr, ticker_obj, 'info')
 
                 if not info_dict or 'symbol' not in info_dict:
-                    logger.warning(f"Could not retrieve valid info for ticker '{ticker}'.")
+                    logger.warning("Could not retrieve valid info for ticker '%s'.", ticker)
                     return None
                 return info_dict
             except Exception as e:
-                logger.error(f"An error occurred fetching info for {ticker}: {e}")
+                logger.error("An error occurred fetching info for %s: %s", ticker, e)
                 return None
 
-    async def _fetch_and_cache_ticker(self, ticker: str, end_date: str) -> bool:
+    def _get_cache_path(self, ticker: str) -> str:
+        """Returns the Parquet cache path for a ticker."""
+        return os.path.join(self.cache_dir, f"{ticker}.parquet")
+
+    @staticmethod
+    def _read_last_cached_date(file_path: str) -> Optional[pd.Timestamp]:
+        """
+        Reads the last cached date from the Parquet footer statistics of the
+        index column, without loading any row data.
+
+        Returns:
+            The latest date in the file, or None if it is missing or unreadable.
+        """
+        if not os.path.exists(file_path):
+            return None
+        try:
+            metadata = pq.read_metadata(file_path)
+            pandas_metadata = json.loads(metadata.metadata[b"pandas"])
+            index_column = pandas_metadata["index_columns"][0]
+            column_position = metadata.schema.names.index(index_column)
+
+            last_date = None
+            for row_group in range(metadata.num_row_groups):
+                stats = metadata.row_group(row_group).column(column_position).statistics
+                if stats is None or not stats.has_min_max:
+                    return None
+                if last_date is None or stats.max > last_date:
+                    last_date = stats.max
+            return pd.Timestamp(last_date) if last_date is not None else None
+        except Exception as e:
+            logger.warning("Could not read cache metadata from %s: %s", file_path, e)
+            return None
+
+    @staticmethod
+    def _read_close_table(file_path: str, ticker: str, start_date: str, end_date: str) -> pa.Table:
+        """
+        Reads only the date index and Close columns of a cached file, filtered
+        to [start_date, end_date], as a two-column Arrow table ('Date', ticker).
+        """
+        schema = pq.read_schema(file_path)
+        pandas_metadata = json.loads(schema.metadata[b"pandas"])
+        index_column = pandas_metadata["index_columns"][0]
+        # Multi-level yfinance columns are flattened to "('Close', 'TICKER')" in Parquet
+        close_column = next(
+            name for name in schema.names if name == "Close" or name.startswith("('Close'")
+        )
+        table = pq.read_table(
+            file_path,
+            columns=[index_column, close_column],
+            filters=[
+                (index_column, ">=", pd.Timestamp(start_date)),
+                (index_column, "<=", pd.Timestamp(end_date)),
+            ],
+        )
+        return table.rename_columns([DATE_COLUMN, ticker])
+
+    @staticmethod
+    def _is_cache_stale(last_cached_date: Optional[pd.Timestamp], end_date: str) -> bool:
+        """
+        Checks whether a cache is missing or ends before the last trading day
+        before `end_date` (exclusive, as in yf.download), so weekends and
+        exchange holidays do not force a refetch.
+        """
+        if last_cached_date is None:
+            return True
+        last_trading_day = pd.Timestamp(end_date).normalize() - _TRADING_DAY
+        return last_cached_date.tz_localize(None).normalize() < last_trading_day
+
+    @staticmethod
+    def _close_column(data: pd.DataFrame) -> pd.Series:
+        """Returns the Close column of a flat or (Price, Ticker) multi-level frame."""
+        close = data["Close"]
+        return close.iloc[:, 0] if isinstance(close, pd.DataFrame) else close
+
+    @classmethod
+    def _overlap_matches(cls, cached_data: pd.DataFrame, new_data: pd.DataFrame) -> bool:
+        """
+        Checks that a fresh download still reports the cached last row's
+        adjusted close, i.e. the cached history has not been re-adjusted since.
+        """
+        last_date = cached_data.index[-1]
+        if len(new_data) == 0 or new_data.index[0] != last_date:
+            return False
+        cached_close = cls._close_column(cached_data).iloc[-1]
+        new_close = cls._close_column(new_data).iloc[0]
+        return bool(np.isclose(new_close, cached_close, rtol=1e-9, atol=0.0))
+
+    async def _download(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """Downloads adjusted daily history, rate-limited by the shared download semaphore."""
+        async with self.download_semaphore:
+            return await asyncio.to_thread(
+                yf.download,
+                ticker,
+                start=start_date,
+                end=end_date,
+                auto_adjust=True,
+                progress=False,
+            )
+
+    async def _fetch_and_cache_ticker(
+        self, ticker: str, end_date: str, last_cached_date: Optional[pd.Timestamp] = None
+    ) -> bool:
         """
-        Fetches a long history for a single ticker and saves it to a Parquet file.
+        Fetches history for a single ticker and saves it to a Parquet file.
+        New tickers are fetched from CACHE_START_DATE. Existing caches (ending at
+        `last_cached_date`) are extended from their last cached row; if that
+        overlapping row's adjusted close has changed (a split or dividend since
+        the cache was written), the full history is fetched again instead.
         Uses a semaphore and a retry mechanism to handle network errors.
         """
         max_retries = 3
         retry_delay = 5
 
+        file_path = self._get_cache_path(ticker)
+        if last_cached_date is not None:
+            # Also normalizes a tz-aware cached index before comparing with the naive end_date
+            if not self._is_cache_stale(last_cached_date, end_date):
+                return True
+            fetch_start_date = last_cached_date.strftime('%Y-%m-%d')
+        else:
+            fetch_start_date = CACHE_START_DATE
+
         for attempt in range(max_retries):
-            # Use a tighter semaphore for downloads as they are more intensive
-            async with asyncio.Semaphore(1):
-                try:
-                    ticker_data = await asyncio.to_thread(
-                        yf.download,
-                        ticker,
-                        start=CACHE_START_DATE,
-                        end=end_date,
-                        auto_adjust=True,
-                        progress=False,
-                    )
+            try:
+                # Only the download itself is rate-limited; retries sleep outside the semaphore
+                ticker_data = await self._download(ticker, fetch_start_date, end_date)
 
-                    if ticker_data.empty:
-                        return False
+                if ticker_data.empty:
+                    # No new rows since the last cached date is not a failure
+                    return last_cached_date is not None
 
-                    if not ticker_data.index.is_unique:
-                        logger.warning(f"Duplicate dates found for {ticker}. Keeping last.")
-                        ticker_data = ticker_data[~ticker_data.index.duplicated(keep='last')]
+                if last_cached_date is not None:
+                    cached_data = await asyncio.to_thread(pd.read_parquet, file_path)
+                    if self._overlap_matches(cached_data, ticker_data):
+                        if len(ticker_data) == 1:
+                            return True  # Only the overlapping row; nothing new to append
+                        ticker_data = pd.concat([cached_data, ticker_data])
+                    else:
+                        logger.info("Adjusted history changed for %s. Refetching full history.", ticker)
+                        ticker_data = await self._download(ticker, CACHE_START_DATE, end_date)
+                        if ticker_data.empty:
+                            return False
 
-                    file_path = os.path.join(self.cache_dir, f"{ticker}.parquet")
-                    await asyncio.to_thread(ticker_data.to_parquet, file_path)
-                    return True
+                if not ticker_data.index.is_unique:
+                    logger.warning("Duplicate dates found for %s. Keeping last.", ticker)
+                    ticker_data = ticker_data[~ticker_data.index.duplicated(keep='last')]
 
-                except Exception as e:
-                    logger.warning(f"Attempt {attempt + 1} failed for {ticker}: {e}")
-                    if attempt < max_retries - 1:
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        logger.error(f"Could not fetch data for {ticker} after {max_retries} attempts.")
-                        return False
+                await asyncio.to_thread(ticker_data.to_parquet, file_path)
+                return True
+
+            except Exception as e:
+                logger.warning("Attempt %d failed for %s: %s", attempt + 1, ticker, e)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay)
+                else:
+                    logger.error("Could not fetch data for %s after %d attempts.", ticker, max_retries)
+                    return False
         return False
 
     async def get_historical_closes(
@@ -105,39 +276,50 @@ class YFinanceHandler:
         Asynchronously fetches historical adjusted close prices for a list of tickers,
         utilizing a robust Parquet-based cache.
         """
-        all_series = []
+        # Each footer is read once, off the event loop, and shared with the fetch step
+        last_cached_dates = await asyncio.gather(*(
+            asyncio.to_thread(self._read_last_cached_date, self._get_cache_path(t)) for t in tickers
+        ))
+        last_cached_by_ticker = dict(zip(tickers, last_cached_dates))
         tickers_to_fetch = [
-            t for t in tickers if not os.path.exists(os.path.join(self.cache_dir, f"{t}.parquet"))
+            t for t in tickers if self._is_cache_stale(last_cached_by_ticker[t], end_date)
         ]
         
         if tickers_to_fetch:
-            logger.info(f"Cache miss for {len(tickers_to_fetch)} tickers. Fetching now...")
-            for i, ticker in enumerate(tickers_to_fetch):
-                status_msg = f"--> Fetching {i + 1}/{len(tickers_to_fetch)}: {ticker.ljust(10)}"
-                sys.stdout.write(f"\r{status_msg}")
-                sys.stdout.flush()
-                await self._fetch_and_cache_ticker(ticker, end_date)
-            sys.stdout.write("\n")
+            logger.info("Cache miss or stale cache for %d tickers. Fetching now...", len(tickers_to_fetch))
+            completed = 0
+
+            async def fetch_with_progress(ticker: str) -> bool:
+                nonlocal completed
+                fetched = await self._fetch_and_cache_ticker(ticker, end_date, last_cached_by_ticker[ticker])
+                completed += 1
+                self._report_progress("Fetching", ticker, completed, len(tickers_to_fetch))
+                return fetched
+
+            await asyncio.gather(*(fetch_with_progress(t) for t in tickers_to_fetch))
 
         logger.info("Loading data from cache and slicing to requested date range...")
+        close_tables: List[pa.Table] = []
         for i, ticker in enumerate(tickers):
-            status_msg = f"--> Loading ticker data {i + 1}/{len(tickers)}: {ticker.ljust(10)}"
-            sys.stdout.write(f"\r{status_msg}")
-            sys.stdout.flush()
+            self._report_progress("Loading", ticker, i + 1, len(tickers))
 
-            file_path = os.path.join(self.cache_dir, f"{ticker}.parquet")
+            file_path = self._get_cache_path(ticker)
             if os.path.exists(file_path):
                 try:
-                    data = await asyncio.to_thread(pd.read_parquet, file_path)
-                    series = data["Close"].loc[start_date:end_date]
-                    series.name = ticker
-                    all_series.append(series)
+                    table = await asyncio.to_thread(
+                        self._read_close_table, file_path, ticker, start_date, end_date
+                    )
+                    close_tables.append(table)
                 except Exception as e:
-                    logger.error(f"Failed to read or slice cache for {ticker}: {e}")
-        
-        sys.stdout.write("\n")
+                    logger.error("Failed to read or slice cache for %s: %s", ticker, e)
         
-        if not all_series:
+        if not close_tables:
             return None
 
-        return pd.concat(all_series, axis=1)
+        # Align all tickers on date with Arrow's C++ hash join and convert to pandas once
+        merged = functools.reduce(
+            lambda left, right: left.join(right, keys=DATE_COLUMN, join_type="full outer"),
+            close_tables,
+        )
+        merged = merged.sort_by(DATE_COLUMN).combine_chunks()
+        return merged.to_pandas(self_destruct=True).set_index(DATE_COLUMN)
@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+
+# Run Numba CUDA kernels on the CPU simulator so GPU code is tested without a device.
+# Must be set before numba is first imported; export NUMBA_ENABLE_CUDASIM=0 to use a real GPU.
+os.environ.setdefault("NUMBA_ENABLE_CUDASIM", "1")
@@ -0,0 +1,191 @@
+# tests/test_financial_calculations.py
+
+import pytest
+import numpy as np
+
+from utils.financial_calculations import (
+    calculate_cumulative_log_prices,
+    calculate_horizon_log_returns,
+    calculate_log_returns
+)
+
+def test_calculate_log_returns_matches_ratio_formula():
+    """
+    Tests that log returns equal ln(P_t / P_{t-1}) for a simple price series.
+    """
+    prices = np.array([100.0, 105.0, 102.0, 110.0])
+    expected = np.log(prices[1:] / prices[:-1])
+
+    log_returns = calculate_log_returns(prices)
+
+    assert log_returns.shape == (3,)
+    np.testing.assert_allclose(log_returns, expected, rtol=1e-12)
+
+def test_calculate_log_returns_writes_into_out_buffer():
+    """
+    Tests that a preallocated output buffer is filled and returned.
+    """
+    prices = np.array([10.0, 11.0, 12.1])
+    out = np.empty(2)
+
+    result = calculate_log_returns(prices, out=out)
+
+    assert result is out
+    np.testing.assert_allclose(out, np.log([1.1, 1.1]), rtol=1e-12)
+
+def test_calculate_log_returns_keeps_float32():
+    """
+    Tests that float32 input is computed and returned in float32.
+    """
+    prices = np.array([100.0, 101.0, 99.0], dtype=np.float32)
+    assert calculate_log_returns(prices).dtype == np.float32
+
+def test_calculate_log_returns_invalid_input():
+    """
+    Tests that too-short series raise a ValueError.
+    """
+    with pytest.raises(ValueError, match="at least two values"):
+        calculate_log_returns(np.array([100.0]))
+    with pytest.raises(ValueError, match="1D or 2D"):
+        calculate_log_returns(np.ones((3, 2, 2)))
+
+@pytest.mark.parametrize("out", [
+    np.zeros((3, 3), order="F"),
+    np.zeros((20, 3)),
+    np.zeros((3, 3), dtype=np.float32),
+])
+def test_calculate_log_returns_rejects_unsuitable_out(out):
+    """
+    Tests that an `out` of the wrong shape, dtype or memory order raises instead of being ignored.
+    """
+    prices = np.ascontiguousarray(np.linspace(100.0, 120.0, 4)[:, None] * [1.0, 2.0, 3.0])
+
+    with pytest.raises(ValueError, match="out must be a C-contiguous float64 array of shape"):
+        calculate_log_returns(prices, out=out)
+
+def test_calculate_log_returns_matrix_of_assets():
+    """
+    Tests that a (T, N) price matrix yields per-asset log returns in one call.
+    """
+    prices = np.array([
+        [100.0, 50.0, 10.0],
+        [101.0, 49.0, 10.5],
+        [103.0, 51.0, 10.2],
+    ])
+
+    log_returns = calculate_log_returns(prices)
+
+    assert log_returns.shape == (2, 3)
+    for asset in range(prices.shape[1]):
+        np.testing.assert_allclose(log_returns[:, asset], calculate_log_returns(prices[:, asset].copy()), rtol=1e-12)
+
+def test_calculate_log_returns_large_series():
+    """
+    Tests that long series (which may take the Numba path) match the NumPy formula.
+    """
+    rng = np.random.default_rng(42)
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0, 0.01, 100_000)))
+
+    log_returns = calculate_log_returns(prices)
+
+    np.testing.assert_allclose(log_returns, np.log(prices[1:] / prices[:-1]), rtol=1e-9, atol=1e-12)
+
+def test_calculate_log_returns_small_returns_keep_precision():
+    """
+    Tests that tiny returns on a large price level are not lost to cancellation,
+    as they would be when differencing log prices.
+    """
+    prices = 4_000.0 * (1.0 + 1e-6 * np.arange(1_000))
+    expected = np.log1p(np.diff(prices) / prices[:-1])
+
+    log_returns = calculate_log_returns(prices)
+
+    np.testing.assert_allclose(log_returns, expected, rtol=5e-10)
+
+def test_calculate_log_returns_numba_path_propagates_invalid_prices(monkeypatch):
+    """
+    Tests that the compiled kernel still yields NaN/inf for missing or zero prices.
+    """
+    from utils import financial_calculations
+    if not financial_calculations._NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+
+    monkeypatch.setattr(financial_calculations, "_NUMBA_PARALLEL", True)
+    monkeypatch.setattr(financial_calculations, "_NUMBA_MIN_SIZE", 0)
+    prices = np.array([100.0, 101.0, np.nan, 102.0, 0.0, 103.0])
+
+    log_returns = calculate_log_returns(prices)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.testing.assert_allclose(log_returns, np.log(prices[1:] / prices[:-1]), rtol=1e-12)
+
+def test_calculate_log_returns_numexpr_path(monkeypatch):
+    """
+    Tests the numexpr path (when installed) against the NumPy formula.
+    """
+    numexpr = pytest.importorskip("numexpr")
+    from utils import financial_calculations
+
+    monkeypatch.setattr(financial_calculations, "_NUMBA_PARALLEL", False)
+    monkeypatch.setattr(financial_calculations, "_load_numexpr", lambda: numexpr)
+    prices = np.linspace(50.0, 150.0, 20_000)
+
+    log_returns = calculate_log_returns(prices)
+
+    np.testing.assert_allclose(log_returns, np.log(prices[1:] / prices[:-1]), rtol=1e-12)
+
+def test_calculate_log_returns_float32_mode():
+    """
+    Tests that float64 prices can be computed in float32 on request.
+    """
+    prices = np.linspace(100.0, 110.0, 1_000)
+
+    log_returns = calculate_log_returns(prices, dtype=np.float32)
+
+    assert log_returns.dtype == np.float32
+    np.testing.assert_allclose(log_returns, np.log(prices[1:] / prices[:-1]), rtol=1e-3, atol=1e-7)
+
+def test_calculate_horizon_log_returns_from_cumulative_log_prices():
+    """
+    Tests that k-period returns from cumulative log prices equal ln(P_t / P_{t-k}).
+    """
+    prices = np.array([100.0, 102.0, 101.0, 105.0, 107.0])
+    cumulative = calculate_cumulative_log_prices(prices)
+
+    np.testing.assert_allclose(calculate_horizon_log_returns(cumulative, 1), calculate_log_returns(prices), rtol=1e-12)
+    np.testing.assert_allclose(calculate_horizon_log_returns(cumulative, 3), np.log(prices[3:] / prices[:-3]), rtol=1e-12)
+
+    with pytest.raises(ValueError, match="Horizon must be between"):
+        calculate_horizon_log_returns(cumulative, 5)
+
+def _force_numba_path(monkeypatch):
+    from utils import financial_calculations
+
+    if not financial_calculations._NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+    monkeypatch.setattr(financial_calculations, "_NUMBA_PARALLEL", True)
+    monkeypatch.setattr(financial_calculations, "_NUMBA_MIN_SIZE", 0)
+    return financial_calculations
+
+def test_log_returns_core_fills_fortran_order_out(monkeypatch):
+    """
+    Tests that a non C-contiguous `out` is filled in place rather than through a reshape copy.
+    """
+    financial_calculations = _force_numba_path(monkeypatch)
+    prices = np.ascontiguousarray(np.linspace(100.0, 120.0, 4)[:, None] * [1.0, 2.0, 3.0])
+    out = np.zeros((3, 3), order="F")
+
+    result = financial_calculations._log_returns_unsafe(prices, out)
+
+    assert result is out
+    np.testing.assert_allclose(out, np.log(prices[1:] / prices[:-1]), rtol=1e-12)
+
+def test_log_returns_core_rejects_oversized_out(monkeypatch):
+    """
+    Tests that an `out` longer than the result is not handed to the unchecked kernel.
+    """
+    financial_calculations = _force_numba_path(monkeypatch)
+    prices = np.linspace(100.0, 110.0, 11)
+
+    with pytest.raises(ValueError):
+        financial_calculations._log_returns_unsafe(prices, np.zeros(20))
@@ -0,0 +1,55 @@
+# tests/test_ibkr_models.py
+
+import numpy as np
+
+from utils.ibkr_models import HistoricalBar, HistoricalBarBatch
+
+def test_historical_bar_batch_from_bars():
+    """
+    Tests that a batch holds one typed column per bar field, in bar order.
+    """
+    bars = [
+        HistoricalBar("20250102", 100.0, 101.5, 99.0, 101.0, 1200, 100.4, 15),
+        HistoricalBar("20250103", 101.0, 103.0, 100.5, 102.5, 900, 101.9, 11),
+    ]
+
+    batch = HistoricalBarBatch.from_bars(bars)
+
+    assert len(batch) == 2
+    assert batch.date.tolist() == ["20250102", "20250103"]
+    np.testing.assert_array_equal(batch.close, [101.0, 102.5])
+    assert batch.close.dtype == np.float64
+    assert batch.volume.dtype == np.int64
+    np.testing.assert_array_equal(batch.count, [15, 11])
+
+def test_historical_bar_batch_from_no_bars():
+    """
+    Tests that an empty bar list gives empty columns.
+    """
+    batch = HistoricalBarBatch.from_bars([])
+    assert len(batch) == 0
+    assert batch.open.shape == (0,)
+
+def test_historical_bar_batch_float32_prices():
+    """
+    Tests that price columns can be stored as float32 while counts stay integral.
+    """
+    bars = [HistoricalBar("20250102", 100.25, 101.5, 99.0, 101.0, 1200, 100.4, 15)]
+
+    batch = HistoricalBarBatch.from_bars(bars, dtype=np.float32)
+
+    assert batch.close.dtype == np.float32
+    assert batch.wap.dtype == np.float32
+    assert batch.volume.dtype == np.int64
+    assert batch.open[0] == np.float32(100.25)
+
+def test_historical_bar_batch_equality_is_identity():
+    """
+    Tests that comparing batches does not compare the array fields element-wise.
+    """
+    first = HistoricalBarBatch.from_bars([])
+    second = HistoricalBarBatch.from_bars([])
+
+    assert first == first
+    assert first != second
+    assert len({first, second}) == 2
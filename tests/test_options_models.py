@@ -1,8 +1,20 @@
 # tests/test_options_models.py
 
+import datetime
+import logging
+
 import pytest
 import numpy as np
-from utils.options_models import black_scholes_price
+from utils.options_models import (
+    black_scholes_price,
+    black_scholes_price_vec,
+    calculate_greeks,
+    calculate_greeks_vec,
+    calculate_time_to_expiration_in_years,
+    generate_pl_profile_at_front_expiry,
+    implied_volatility,
+    implied_volatility_vec
+)
 
 def test_black_scholes_call_at_the_money():
     """
@@ -55,4 +67,215 @@ def test_black_scholes_invalid_option_type():
     Tests that the function handles an invalid option type gracefully.
     """
     price = black_scholes_price(100, 100, 1, 0.05, 0.2, option_type="invalid")
-    assert np.isnan(price)
\ No newline at end of file
+    assert np.isnan(price)
+
+def test_black_scholes_invalid_option_type_at_expiration():
+    """
+    Tests that an invalid option type is rejected even when only the intrinsic value is needed.
+    """
+    price = black_scholes_price(90, 100, 0, 0.05, 0.2, option_type="invalid")
+    assert np.isnan(price)
+
+def test_black_scholes_price_vec_matches_scalar():
+    """
+    Tests that the vectorized pricer agrees with the scalar one, including edge cases.
+    """
+    cases = [
+        (100, 100, 1.0, 0.05, 0.2),
+        (90, 100, 0.5, 0.03, 0.25),
+        (150, 100, 0.1, 0.01, 0.6),
+        (110, 100, 0.0, 0.05, 0.2),   # at expiration
+        (110, 100, 0.5, 0.05, 0.0),   # zero volatility
+        (0.0, 100, 0.5, 0.05, 0.2),   # zero stock price
+        (100, 0.0, 0.5, 0.05, 0.2),   # zero strike
+    ]
+    S, K, T, r, sigma = (np.array(column, dtype=float) for column in zip(*cases))
+
+    for is_call, option_type in ((True, "call"), (False, "put")):
+        vec_prices = black_scholes_price_vec(S, K, T, r, sigma, is_call=is_call)
+        scalar_prices = [black_scholes_price(*case, option_type=option_type) for case in cases]
+        np.testing.assert_allclose(vec_prices, scalar_prices, rtol=1e-10, atol=1e-12)
+
+def test_black_scholes_price_vec_broadcasts_price_grid():
+    """
+    Tests that a grid of stock prices broadcasts against scalar option parameters.
+    """
+    s_grid = np.linspace(80, 120, 41)
+    prices = black_scholes_price_vec(s_grid, 100, 0.25, 0.05, 0.3, is_call=False)
+    assert prices.shape == s_grid.shape
+    assert np.all(np.diff(prices) < 0) # Put value falls as the stock rises
+
+def test_black_scholes_price_accepts_arrays():
+    """
+    Tests that black_scholes_price prices a NumPy array of stock prices in one call.
+    """
+    s_grid = np.array([90.0, 100.0, 110.0])
+    prices = black_scholes_price(s_grid, 100, 1, 0.05, 0.2, option_type="put")
+    assert isinstance(prices, np.ndarray)
+    np.testing.assert_allclose(prices, [black_scholes_price(s, 100, 1, 0.05, 0.2, option_type="put") for s in s_grid], rtol=1e-12)
+    assert np.all(np.isnan(black_scholes_price(s_grid, 100, 1, 0.05, 0.2, option_type="invalid")))
+
+def test_implied_volatility_vec_recovers_sigma():
+    """
+    Tests that the batched IV solver recovers the volatilities used to price a chain
+    and agrees with the scalar solver, including the below-intrinsic and expired cases.
+    """
+    S = np.array([100.0, 100.0, 100.0, 90.0, 100.0])
+    K = np.array([90.0, 100.0, 120.0, 100.0, 100.0])
+    T = np.array([0.5, 1.0, 0.25, 0.75, 0.0])
+    sigma = np.array([0.15, 0.2, 0.45, 0.3, 0.2])
+    is_call = np.array([True, True, False, False, True])
+    prices = black_scholes_price_vec(S, K, T, 0.05, sigma, is_call)
+    prices[3] = 1.0 # Below the discounted intrinsic value of the ITM put
+
+    ivs = implied_volatility_vec(prices, S, K, T, 0.05, is_call)
+
+    np.testing.assert_allclose(ivs[:3], sigma[:3], atol=1e-5)
+    assert ivs[3] == pytest.approx(1e-5)
+    assert np.isnan(ivs[4])
+    scalar_ivs = [implied_volatility(p, s, k, t, 0.05, "call" if c else "put") for p, s, k, t, c in zip(prices, S, K, T, is_call)]
+    np.testing.assert_allclose(ivs, scalar_ivs, atol=1e-5)
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_calculate_greeks_match_finite_differences(option_type):
+    """
+    Tests the closed-form Greeks against central finite differences of the price.
+    """
+    S, K, T, r, sigma, h = 105.0, 100.0, 0.5, 0.04, 0.25, 1e-4
+    def price(S=S, T=T, r=r, sigma=sigma):
+        return black_scholes_price(S, K, T, r, sigma, option_type)
+
+    greeks = calculate_greeks(S, K, T, r, sigma, option_type)
+
+    assert greeks['delta'] == pytest.approx((price(S=S + h) - price(S=S - h)) / (2 * h), rel=1e-6)
+    assert greeks['gamma'] == pytest.approx((price(S=S + 0.01) - 2 * price() + price(S=S - 0.01)) / 0.01**2, rel=1e-4)
+    assert greeks['vega'] == pytest.approx((price(sigma=sigma + h) - price(sigma=sigma - h)) / (2 * h) / 100, rel=1e-6)
+    assert greeks['theta'] == pytest.approx(-(price(T=T + h) - price(T=T - h)) / (2 * h) / 365, rel=1e-6)
+    assert greeks['rho'] == pytest.approx((price(r=r + h) - price(r=r - h)) / (2 * h) / 100, rel=1e-6)
+
+def test_generate_pl_profile_calendar_spread():
+    """
+    Tests a call calendar: the front leg is worth intrinsic and the back leg its BS value.
+    """
+    legs = [
+        {'strike': 100.0, 'type': 'C', 'action': 'SELL', 'quantity': 1, 'initial_price': 2.0, 'expiry': '20250117'},
+        {'strike': 100.0, 'type': 'C', 'action': 'BUY', 'quantity': 1, 'initial_price': 4.0, 'expiry': '20250221'},
+    ]
+    s_range = np.linspace(80.0, 120.0, 81)
+    front, back = datetime.datetime(2025, 1, 17), datetime.datetime(2025, 2, 21)
+
+    profile = generate_pl_profile_at_front_expiry(legs, s_range, front, back, 0.05, 0.3)
+
+    assert profile is not None
+    assert isinstance(profile["pnl_values"], np.ndarray)
+    T_back = (back - front).total_seconds() / (365.25 * 24 * 60 * 60)
+    expected = [
+        100 * black_scholes_price(s, 100.0, T_back, 0.05, 0.3, "call") - 100 * max(s - 100.0, 0.0) - 200.0
+        for s in s_range
+    ]
+    np.testing.assert_allclose(profile["pnl_values"], expected, rtol=1e-10, atol=1e-8)
+    assert profile["total_initial_cost"] == pytest.approx(200.0)
+    assert len(profile["breakeven_points"]) == 2
+
+def test_generate_pl_profile_breakevens_exact_on_coarse_grid():
+    """
+    Tests that breakevens are the true zeros of the P&L curve, not grid interpolations.
+    """
+    legs = [
+        {'strike': 100.0, 'type': 'C', 'action': 'SELL', 'quantity': 1, 'initial_price': 2.0, 'expiry': '20250117'},
+        {'strike': 100.0, 'type': 'C', 'action': 'BUY', 'quantity': 1, 'initial_price': 4.0, 'expiry': '20250221'},
+    ]
+    front, back = datetime.datetime(2025, 1, 17), datetime.datetime(2025, 2, 21)
+    T_back = (back - front).total_seconds() / (365.25 * 24 * 60 * 60)
+
+    def pnl(s):
+        return 100 * black_scholes_price(s, 100.0, T_back, 0.05, 0.3, "call") - 100 * max(s - 100.0, 0.0) - 200.0
+
+    profile = generate_pl_profile_at_front_expiry(legs, np.linspace(80.0, 120.0, 9), front, back, 0.05, 0.3)
+
+    assert profile is not None
+    assert len(profile["breakeven_points"]) == 2
+    for breakeven in profile["breakeven_points"]:
+        assert abs(pnl(breakeven)) < 1e-9
+
+@pytest.mark.parametrize("S, K, T, sigma, option_type", [
+    (100.0, 100.0, 0.5, 0.2, "call"),   # ATM: Newton warm start
+    (100.0, 140.0, 0.1, 0.35, "call"),  # Far OTM, low vega
+    (100.0, 70.0, 1.5, 1.8, "put"),     # Very high volatility
+    (100.0, 110.0, 0.02, 0.15, "p"),
+    (100.0, 100.0, 0.5, 4.5, "call"),   # Above high_vol: bound expanded to the cap
+])
+def test_implied_volatility_recovers_sigma(S, K, T, sigma, option_type):
+    """
+    Tests that implied_volatility inverts black_scholes_price across moneyness and volatility.
+    """
+    price = black_scholes_price(S, K, T, 0.03, sigma, option_type)
+    assert implied_volatility(price, S, K, T, 0.03, option_type) == pytest.approx(sigma, abs=1e-5)
+
+def test_calculate_time_to_expiration_in_years():
+    """
+    Tests TTE from an explicit valuation date, expiry clamping, and that bad dates keep raising.
+    """
+    assert calculate_time_to_expiration_in_years("2025-07-01", "2025-01-01") == pytest.approx(181 / 365.25)
+    assert calculate_time_to_expiration_in_years("2025-01-01", "2025-07-01") == 1e-9
+    for _ in range(2): # Failed parses must not be memoized
+        with pytest.raises(ValueError):
+            calculate_time_to_expiration_in_years("2025/07/01", "2025-01-01")
+
+def test_generate_pl_profile_nan_back_leg_counts_as_zero():
+    """
+    Tests that NaN back-leg prices (here from a NaN IV) are valued at 0 and reported once.
+    """
+    legs = [{'strike': 100.0, 'type': 'P', 'action': 'BUY', 'quantity': 1, 'initial_price': 3.0, 'expiry': '20250221'}]
+    messages = []
+
+    profile = generate_pl_profile_at_front_expiry(
+        legs, np.linspace(90.0, 110.0, 5), datetime.datetime(2025, 1, 17), datetime.datetime(2025, 2, 21),
+        0.05, float("nan"), status_callback=messages.append
+    )
+
+    assert profile is not None
+    np.testing.assert_allclose(profile["pnl_values"], -300.0)
+    warnings = [m["message"] for m in messages if m["type"] == "warning"]
+    assert len(warnings) == 1 and "5 (leg, stock price) point(s)" in warnings[0]
+
+def test_calculate_greeks_vec_matches_scalar():
+    """
+    Tests that batched Greeks agree with calculate_greeks, including the expiry, zero-vol and S=0 cases.
+    """
+    cases = [
+        (105.0, 100.0, 0.5, 0.04, 0.25),
+        (80.0, 100.0, 1.5, 0.01, 0.6),
+        (100.0, 100.0, 0.0, 0.05, 0.2),  # at expiration, ATM
+        (120.0, 100.0, 0.5, 0.05, 0.0),  # zero volatility
+        (0.0, 100.0, 0.5, 0.05, 0.2),    # zero stock price
+    ]
+    S, K, T, r, sigma = (np.array(column) for column in zip(*cases))
+
+    for is_call, option_type in ((True, "call"), (False, "put")):
+        batch = calculate_greeks_vec(S, K, T, r, sigma, is_call=is_call)
+        for i, case in enumerate(cases):
+            expected = calculate_greeks(*case, option_type=option_type)
+            actual = [getattr(batch, name)[i] for name in expected]
+            np.testing.assert_allclose(actual, list(expected.values()), rtol=1e-9, atol=1e-14)
+
+def test_implied_volatility_brent_fallback(monkeypatch):
+    """
+    Tests the Brent path on its own by disabling the Newton warm start.
+    """
+    from utils import options_models
+
+    monkeypatch.setattr(options_models, "_IV_NEWTON_MAX_ITER", 0)
+    for sigma, option_type in ((0.2, "call"), (0.65, "put"), (4.5, "call")):
+        price = black_scholes_price(100.0, 95.0, 0.75, 0.03, sigma, option_type)
+        assert implied_volatility(price, 100.0, 95.0, 0.75, 0.03, option_type) == pytest.approx(sigma, abs=1e-5)
+
+def test_black_scholes_edge_case_logged_on_every_call(caplog):
+    """
+    Tests that edge-case logging is not swallowed by the scalar price cache.
+    """
+    with caplog.at_level(logging.DEBUG, logger="utils.options_models"):
+        for _ in range(2):
+            assert black_scholes_price(105.0, 100.0, 0.0, 0.05, 0.2, "call") == pytest.approx(5.0) # type: ignore
+
+    assert sum("T near zero" in record.getMessage() for record in caplog.records) == 2
@@ -0,0 +1,70 @@
+# tests/test_options_models_cuda.py
+
+import numpy as np
+import pytest
+
+from utils import options_models_cuda
+from utils.options_models import black_scholes_price_vec
+from utils.options_models_cuda import black_scholes_price_batch
+
+pytestmark = pytest.mark.skipif(
+    not options_models_cuda.cuda_pricing_available(),
+    reason="numba CUDA (or NUMBA_ENABLE_CUDASIM=1) is not available",
+)
+
+@pytest.fixture(autouse=True)
+def small_cuda_batches(monkeypatch):
+    """Sends even tiny batches to the kernel; the simulator is too slow for real batch sizes."""
+    monkeypatch.setattr(options_models_cuda, "CUDA_MIN_BATCH_SIZE", 1)
+
+def test_batch_matches_vectorized_prices():
+    """
+    Tests the CUDA kernel against the CPU pricer over a grid of calls and puts.
+    The kernel's normal CDF approximation is accurate to ~7.5e-8, i.e. ~2e-5 in price here.
+    """
+    S = np.linspace(50.0, 150.0, 300)
+    is_call = np.arange(S.size) % 2 == 0
+
+    prices = black_scholes_price_batch(S, 100.0, 0.5, 0.03, 0.25, is_call)
+
+    assert prices.shape == S.shape
+    np.testing.assert_allclose(prices, black_scholes_price_vec(S, 100.0, 0.5, 0.03, 0.25, is_call), atol=5e-5)
+
+def test_batch_broadcasts_to_a_grid():
+    """
+    Tests that a (prices x strikes) grid keeps its broadcast shape.
+    """
+    S = np.linspace(80.0, 120.0, 20)[:, None]
+    K = np.array([90.0, 100.0, 110.0])
+
+    prices = black_scholes_price_batch(S, K, 0.25, 0.05, 0.3, False)
+
+    assert prices.shape == (20, 3)
+    np.testing.assert_allclose(prices, black_scholes_price_vec(S, K, 0.25, 0.05, 0.3, False), atol=5e-5)
+
+@pytest.mark.parametrize("is_call", [True, False])
+def test_batch_reprices_degenerate_inputs_on_cpu(is_call):
+    """
+    Tests that T <= 0, sigma <= 0, S/K <= 0 and non-finite inputs match the CPU
+    pricer's edge-case handling instead of going through the closed form.
+    """
+    S = np.array([105.0, 105.0, 95.0, 0.0, 105.0, np.nan, np.inf, 100.0, 100.0, 100.0, 100.0, 100.0])
+    K = np.array([100.0, 100.0, 100.0, 100.0, 0.0, 100.0, 100.0, np.inf, 100.0, 100.0, 100.0, 100.0])
+    T = np.array([0.0, -1.0, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, np.nan, np.inf, 0.5, 0.5])
+    sigma = np.array([0.2, 0.2, 0.0, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.2, np.nan, 0.2])
+    r = np.array([0.03] * 11 + [np.nan])
+
+    prices = black_scholes_price_batch(S, K, T, r, sigma, is_call)
+
+    np.testing.assert_allclose(prices, black_scholes_price_vec(S, K, T, r, sigma, is_call), atol=1e-12)
+
+def test_small_batch_uses_cpu(monkeypatch):
+    """
+    Tests that batches below CUDA_MIN_BATCH_SIZE never launch the kernel.
+    """
+    monkeypatch.setattr(options_models_cuda, "CUDA_MIN_BATCH_SIZE", 1_000)
+    monkeypatch.setattr(options_models_cuda, "_bs_kernel", None) # Launching would raise
+
+    prices = black_scholes_price_batch(np.array([95.0, 105.0]), 100.0, 0.5, 0.03, 0.25)
+
+    np.testing.assert_array_equal(prices, black_scholes_price_vec(np.array([95.0, 105.0]), 100.0, 0.5, 0.03, 0.25))
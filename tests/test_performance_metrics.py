@@ -2,8 +2,11 @@
 
 import pytest
 import numpy as np
+import pandas as pd
 
+from utils import performance_metrics
 from utils.options_models import black_scholes_price
+from utils.performance_metrics import calculate_max_drawdown, calculate_sharpe_ratio
 
 def test_black_scholes_call_at_the_money():
     """
@@ -56,4 +59,88 @@ def test_black_scholes_invalid_option_type():
     Tests that the function handles an invalid option type gracefully.
     """
     price = black_scholes_price(100, 100, 1, 0.05, 0.2, option_type="invalid")
-    assert np.isnan(price)
\ No newline at end of file
+    assert np.isnan(price)
+
+
+def _sample_prices(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0.001, 0.01, n))))
+
+
+def _reference_sharpe(returns, risk_free_rate, periods_per_year):
+    periodic_rf = (1 + risk_free_rate) ** (1 / periods_per_year) - 1
+    excess = np.asarray(returns, dtype=np.float64) - periodic_rf
+    return np.mean(excess) / np.std(excess) * np.sqrt(periods_per_year)
+
+
+@pytest.mark.parametrize("numba_available", [True, False])
+def test_sharpe_ratio_array_matches_numpy_formula(monkeypatch, numba_available):
+    """The compiled kernel and the NumPy fallback agree with the textbook formula."""
+    monkeypatch.setattr(performance_metrics, "_NUMBA_AVAILABLE",
+                        numba_available and performance_metrics._NUMBA_AVAILABLE)
+    returns = _sample_prices().pct_change().to_numpy()[1:]
+
+    result = calculate_sharpe_ratio(returns, 0.02, 252)
+
+    assert result == pytest.approx(_reference_sharpe(returns, 0.02, 252), rel=1e-9) # type: ignore
+
+
+@pytest.mark.parametrize("numba_available", [True, False])
+def test_sharpe_ratio_series_skips_nans(monkeypatch, numba_available):
+    """A Series keeps pandas' skipna semantics, e.g. the leading NaN of pct_change()."""
+    monkeypatch.setattr(performance_metrics, "_NUMBA_AVAILABLE",
+                        numba_available and performance_metrics._NUMBA_AVAILABLE)
+    returns = _sample_prices().pct_change()
+    returns.iloc[100] = np.nan
+    expected = _reference_sharpe(returns.dropna(), 0.02, 252)
+
+    result = calculate_sharpe_ratio(returns, 0.02, 252)
+
+    assert np.isfinite(result)
+    assert result == pytest.approx(expected, rel=1e-9) # type: ignore
+
+
+def test_sharpe_ratio_array_with_nan_is_nan():
+    """Raw arrays are not NaN-filtered, matching NumPy's reductions."""
+    returns = _sample_prices().pct_change().to_numpy()
+
+    assert np.isnan(calculate_sharpe_ratio(returns, 0.02, 252))
+
+
+@pytest.mark.parametrize("numba_available", [True, False])
+def test_max_drawdown_array(monkeypatch, numba_available):
+    monkeypatch.setattr(performance_metrics, "_NUMBA_AVAILABLE",
+                        numba_available and performance_metrics._NUMBA_AVAILABLE)
+    equity = np.array([100.0, 120.0, 90.0, 130.0, 104.0])
+
+    assert calculate_max_drawdown(equity) == pytest.approx(-0.25) # type: ignore
+
+
+@pytest.mark.parametrize("numba_available", [True, False])
+def test_max_drawdown_series_matches_array(monkeypatch, numba_available):
+    monkeypatch.setattr(performance_metrics, "_NUMBA_AVAILABLE",
+                        numba_available and performance_metrics._NUMBA_AVAILABLE)
+    prices = _sample_prices()
+    high_water_mark = np.maximum.accumulate(prices.to_numpy())
+    expected = np.min((prices.to_numpy() - high_water_mark) / high_water_mark)
+
+    assert calculate_max_drawdown(prices) == pytest.approx(expected, rel=1e-12) # type: ignore
+
+
+@pytest.mark.parametrize("numba_available", [True, False])
+def test_max_drawdown_series_skips_nan_gaps(monkeypatch, numba_available):
+    """NaN gaps (including a leading one) are skipped; the peak carries across them."""
+    monkeypatch.setattr(performance_metrics, "_NUMBA_AVAILABLE",
+                        numba_available and performance_metrics._NUMBA_AVAILABLE)
+    equity = pd.Series([np.nan, 100.0, np.nan, 120.0, np.nan, 90.0, 110.0])
+
+    assert calculate_max_drawdown(equity) == pytest.approx(-0.25) # type: ignore
+
+
+@pytest.mark.parametrize("numba_available", [True, False])
+def test_max_drawdown_constant_curve_is_zero(monkeypatch, numba_available):
+    monkeypatch.setattr(performance_metrics, "_NUMBA_AVAILABLE",
+                        numba_available and performance_metrics._NUMBA_AVAILABLE)
+
+    assert calculate_max_drawdown(np.full(50, 100.0)) == 0.0
+    assert calculate_max_drawdown(pd.Series(np.full(50, 100.0))) == 0.0
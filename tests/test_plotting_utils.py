@@ -2,28 +2,40 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import Dict, Any
+import pytest
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
 # FIX: Import Figure directly from the correct module
 from matplotlib.figure import Figure
 
 from utils.plotting_utils import create_pnl_figure
 
-def test_create_pnl_figure_with_valid_data():
+@pytest.fixture(scope="module")
+def valid_strategy_details() -> Mapping[str, Any]:
+    """
+    Builds the P&L plotting data once per module. The arrays are read-only and
+    the mapping is frozen, so tests can share it without copying.
+    """
+    s_values = np.linspace(80, 120, 50)
+    pnl_values = np.random.default_rng(0).standard_normal(50) * 100
+    s_values.flags.writeable = False
+    pnl_values.flags.writeable = False
+    return MappingProxyType({
+        "s_values_for_plot": s_values,
+        "pnl_values_for_plot": pnl_values,
+        "description": "Test Strategy"
+    })
+
+def test_create_pnl_figure_with_valid_data(valid_strategy_details: Mapping[str, Any]):
     """
     Tests that the function returns a valid Matplotlib Figure and sets titles
     and labels correctly when given proper data.
     """
-    # FIX: Add an explicit type hint to the dictionary
-    strategy_details: Dict[str, Any] = {
-        "s_values_for_plot": np.linspace(80, 120, 50),
-        "pnl_values_for_plot": np.random.randn(50) * 100,
-        "description": "Test Strategy"
-    }
     ticker = "TEST"
     current_price = 100.0
     
-    fig = create_pnl_figure(strategy_details, ticker, current_price, 90, 110)
+    fig = create_pnl_figure(valid_strategy_details, ticker, current_price, 90, 110) # type: ignore
 
     # FIX: Check against the correctly imported Figure class
     assert isinstance(fig, Figure)
@@ -61,4 +73,22 @@ def test_create_pnl_figure_with_empty_data():
     assert len(ax.texts) > 0
     assert ax.texts[0].get_text() == "No plotting data available."
 
-    plt.close(fig)
\ No newline at end of file
+    plt.close(fig)
+
+
+def test_create_pnl_figure_redraws_into_existing_figure(valid_strategy_details: Mapping[str, Any]):
+    """
+    Tests that passing a previous figure redraws into its existing Axes instead
+    of stacking new Axes or lines on top of the old plot.
+    """
+    fig = create_pnl_figure(valid_strategy_details, "TEST", 100.0, 90, 110) # type: ignore
+    ax = fig.axes[0]
+    line_count = len(ax.get_lines())
+
+    redrawn = create_pnl_figure(valid_strategy_details, "TEST", 101.0, None, None, fig=fig) # type: ignore
+
+    assert redrawn is fig
+    assert fig.axes == [ax]
+    assert len(ax.get_lines()) == line_count
+
+    plt.close(fig)
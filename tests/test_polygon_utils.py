@@ -4,10 +4,13 @@ import pytest
 import datetime
 from utils.polygon_utils import (
     format_polygon_option_symbol,
+    format_polygon_option_symbols,
     format_polygon_ticker,
     to_polygon_date_str,
-    to_polygon_nanosecond_timestamp
+    to_polygon_nanosecond_timestamp,
+    to_polygon_nanosecond_timestamps
 )
+import numpy as np
 
 # --- Tests for format_polygon_option_symbol ---
 
@@ -21,6 +24,11 @@ def test_format_option_symbol_fractional_strike_put():
     symbol = format_polygon_option_symbol("SPY", "250620", "P", 450.50)
     assert symbol == "O:SPY250620P00450500"
 
+def test_format_option_symbol_strike_not_truncated():
+    """Tests that strikes whose scaled value is not exact in binary are rounded, not truncated."""
+    symbol = format_polygon_option_symbol("F", "250117", "c", 2.01)
+    assert symbol == "O:F250117C00002010"
+
 def test_format_option_symbol_invalid_date():
     """Tests that the function raises a ValueError for an invalid date string."""
     with pytest.raises(ValueError, match="must be 6 digits"):
@@ -36,6 +44,26 @@ def test_format_option_symbol_negative_strike():
     with pytest.raises(ValueError, match="must be a positive number"):
         format_polygon_option_symbol("GOOG", "251219", "C", -150.0)
 
+def test_format_option_symbols_matches_scalar():
+    """Tests that batch formatting matches the per-strike formatter, for one type or one per strike."""
+    strikes = np.array([2.01, 170.0, 450.5])
+    types = ["c", "P", "C"]
+    assert format_polygon_option_symbols("SPY", "250620", types, strikes) == [
+        format_polygon_option_symbol("SPY", "250620", t, k) for t, k in zip(types, strikes.tolist())
+    ]
+    assert format_polygon_option_symbols("SPY", "250620", "P", [450.5]) == ["O:SPY250620P00450500"]
+
+def test_format_option_symbols_invalid_input():
+    """Tests that batch formatting rejects bad strikes and mismatched type lists."""
+    with pytest.raises(ValueError, match="must be a positive number"):
+        format_polygon_option_symbols("SPY", "250620", "C", [100.0, 0.0])
+    with pytest.raises(ValueError, match="must be a positive number, got: inf"):
+        format_polygon_option_symbols("SPY", "250117", "C", [100.0, np.inf])
+    with pytest.raises(ValueError, match="must be a positive number, got: nan"):
+        format_polygon_option_symbols("SPY", "250117", "C", [np.nan])
+    with pytest.raises(ValueError, match="option types for"):
+        format_polygon_option_symbols("SPY", "250620", ["C"], [100.0, 101.0])
+
 
 # --- Tests for format_polygon_ticker ---
 
@@ -64,10 +92,36 @@ def test_to_polygon_date_str():
     """Tests the conversion of a datetime object to a YYYY-MM-DD string."""
     dt = datetime.date(2025, 6, 22)
     assert to_polygon_date_str(dt) == "2025-06-22"
+    assert to_polygon_date_str(datetime.datetime(2025, 6, 22, 15, 30)) == "2025-06-22"
 
 def test_to_polygon_nanosecond_timestamp():
     """Tests the conversion of a datetime object to a nanosecond timestamp."""
     # Using a known timestamp for a specific UTC datetime
     dt = datetime.datetime(2025, 1, 1, 0, 0, 0, tzinfo=datetime.timezone.utc)
     expected_ts = 1735689600 * 1_000_000_000
-    assert to_polygon_nanosecond_timestamp(dt) == expected_ts
\ No newline at end of file
+    assert to_polygon_nanosecond_timestamp(dt) == expected_ts
+
+def test_to_polygon_nanosecond_timestamp_keeps_microseconds():
+    """Tests that sub-second precision is converted exactly, without float rounding."""
+    dt = datetime.datetime(2025, 1, 1, 0, 0, 0, 123456, tzinfo=datetime.timezone.utc)
+    assert to_polygon_nanosecond_timestamp(dt) == 1735689600 * 1_000_000_000 + 123_456_000
+
+def test_to_polygon_nanosecond_timestamps_vectorized():
+    """Tests that datetime64 arrays convert to int64 nanosecond timestamps."""
+    arr = np.array(["2025-01-01T00:00:00", "2025-01-01T00:00:01"], dtype="datetime64[s]")
+    result = to_polygon_nanosecond_timestamps(arr)
+    assert result.dtype == np.int64
+    assert result.tolist() == [1735689600 * 1_000_000_000, 1735689601 * 1_000_000_000]
+
+def test_to_polygon_nanosecond_timestamps_views_nanosecond_input():
+    """Tests that datetime64[ns] input is reinterpreted in place rather than copied."""
+    arr = np.array(["2025-01-01T00:00:00.000000001"], dtype="datetime64[ns]")
+    result = to_polygon_nanosecond_timestamps(arr)
+    assert np.shares_memory(result, arr)
+    assert result.tolist() == [1735689600 * 1_000_000_000 + 1]
+
+def test_to_polygon_nanosecond_timestamps_rejects_nat():
+    """Tests that NaT raises instead of silently becoming INT64_MIN."""
+    arr = np.array(["2025-01-01T00:00:00", "NaT"], dtype="datetime64[s]")
+    with pytest.raises(ValueError, match="NaT"):
+        to_polygon_nanosecond_timestamps(arr)
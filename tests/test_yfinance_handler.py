@@ -0,0 +1,192 @@
+# tests/test_yfinance_handler.py
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from handlers import yfinance_handler
+from handlers.yfinance_handler import YFinanceHandler
+
+def _market_frame(ticker, dates, closes):
+    """Builds a frame shaped like yf.download output: (Price, Ticker) columns, 'Date' index."""
+    columns = pd.MultiIndex.from_product([["Close", "Volume"], [ticker]], names=["Price", "Ticker"])
+    data = np.column_stack([closes, np.full(len(closes), 1000.0)])
+    return pd.DataFrame(data, index=pd.DatetimeIndex(dates, name="Date"), columns=columns)
+
+class _FakeDownload:
+    """Stands in for yf.download, serving each ticker's current history by [start, end)."""
+
+    def __init__(self, histories, delay=0.0):
+        self.histories = histories
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ticker, start, end, **kwargs):
+        with self._lock:
+            self.calls.append((ticker, start, end))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            history = self.histories[ticker]
+            start, end = (pd.Timestamp(x).tz_localize(history.index.tz) for x in (start, end))
+            return history.loc[(history.index >= start) & (history.index < end)]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+@pytest.fixture
+def fake_download(monkeypatch):
+    def install(histories, delay=0.0):
+        fake = _FakeDownload(histories, delay)
+        monkeypatch.setattr(yfinance_handler.yf, "download", fake)
+        return fake
+    return install
+
+WEEK = pd.bdate_range("2025-03-03", "2025-03-07")  # Mon-Fri, no exchange holidays
+
+@pytest.mark.asyncio
+async def test_fresh_fetch_writes_cache_and_returns_closes(tmp_path, fake_download):
+    fake = fake_download({"AAA": _market_frame("AAA", WEEK, [10.0, 11.0, 12.0, 13.0, 14.0])})
+    handler = YFinanceHandler(cache_dir=str(tmp_path))
+
+    closes = await handler.get_historical_closes(["AAA"], "2025-03-01", "2025-03-08")
+
+    assert fake.calls == [("AAA", yfinance_handler.CACHE_START_DATE, "2025-03-08")]
+    assert (tmp_path / "AAA.parquet").exists()
+    assert closes["AAA"].tolist() == [10.0, 11.0, 12.0, 13.0, 14.0]
+    assert list(closes.index) == list(WEEK)
+
+@pytest.mark.asyncio
+async def test_cache_hit_over_weekend_skips_download(tmp_path, fake_download):
+    """A cache ending Friday is fresh for a Monday end date (exclusive), so nothing is downloaded."""
+    fake = fake_download({"AAA": _market_frame("AAA", WEEK, [10.0, 11.0, 12.0, 13.0, 14.0])})
+    handler = YFinanceHandler(cache_dir=str(tmp_path))
+    await handler.get_historical_closes(["AAA"], "2025-03-01", "2025-03-08")
+    fake.calls.clear()
+
+    closes = await handler.get_historical_closes(["AAA"], "2025-03-04", "2025-03-10")
+
+    assert fake.calls == []
+    assert closes["AAA"].tolist() == [11.0, 12.0, 13.0, 14.0]
+
+def test_is_cache_stale_uses_last_trading_day():
+    friday = pd.Timestamp("2025-03-07")
+
+    assert YFinanceHandler._is_cache_stale(None, "2025-03-10")
+    assert not YFinanceHandler._is_cache_stale(friday, "2025-03-09")  # Sunday
+    assert not YFinanceHandler._is_cache_stale(friday, "2025-03-10")  # Monday, exclusive
+    assert YFinanceHandler._is_cache_stale(friday, "2025-03-11")
+    # Good Friday 2025-04-18: a Thursday cache is still fresh on the following Monday
+    assert not YFinanceHandler._is_cache_stale(pd.Timestamp("2025-04-17"), "2025-04-21")
+
+def test_is_cache_stale_new_years_day_on_saturday():
+    """NYSE does not observe a Saturday New Year's Day on the Friday before, so that Friday trades."""
+    assert YFinanceHandler._is_cache_stale(pd.Timestamp("2021-12-30"), "2022-01-01")
+    assert not YFinanceHandler._is_cache_stale(pd.Timestamp("2021-12-31"), "2022-01-03")
+    # A Sunday New Year's Day is observed on Monday 2023-01-02
+    assert not YFinanceHandler._is_cache_stale(pd.Timestamp("2022-12-30"), "2023-01-03")
+
+@pytest.mark.asyncio
+async def test_incremental_append_with_tz_aware_index(tmp_path, fake_download):
+    """A tz-aware cached index is compared with the naive end date without raising."""
+    dates = pd.bdate_range("2025-03-03", "2025-03-12", tz="America/New_York")
+    history = _market_frame("AAA", dates, np.arange(10.0, 18.0))
+    fake = fake_download({"AAA": history.loc[:"2025-03-07"]})
+    handler = YFinanceHandler(cache_dir=str(tmp_path))
+    await handler.get_historical_closes(["AAA"], "2025-03-01", "2025-03-08")
+
+    fake.histories["AAA"] = history
+    fake.calls.clear()
+    assert await handler._fetch_and_cache_ticker("AAA", "2025-03-13", dates[4])
+    assert await handler._fetch_and_cache_ticker("AAA", "2025-03-08", dates[4])
+
+    assert fake.calls == [("AAA", "2025-03-07", "2025-03-13")]
+    assert pd.read_parquet(tmp_path / "AAA.parquet").index.equals(history.index)
+
+@pytest.mark.asyncio
+async def test_incremental_append_downloads_from_last_cached_row(tmp_path, fake_download):
+    dates = pd.bdate_range("2025-03-03", "2025-03-12")
+    history = _market_frame("AAA", dates, np.arange(10.0, 18.0))
+    fake = fake_download({"AAA": history.loc[:"2025-03-07"]})
+    handler = YFinanceHandler(cache_dir=str(tmp_path))
+    await handler.get_historical_closes(["AAA"], "2025-03-01", "2025-03-08")
+
+    fake.histories["AAA"] = history
+    fake.calls.clear()
+    closes = await handler.get_historical_closes(["AAA"], "2025-03-01", "2025-03-13")
+
+    assert fake.calls == [("AAA", "2025-03-07", "2025-03-13")]
+    assert closes["AAA"].tolist() == list(np.arange(10.0, 18.0))
+    assert closes.index.is_unique
+
+@pytest.mark.asyncio
+async def test_readjusted_history_triggers_full_refetch(tmp_path, fake_download):
+    """A changed adjusted close on the overlapping row replaces the cache instead of appending."""
+    dates = pd.bdate_range("2025-03-03", "2025-03-12")
+    fake = fake_download({"AAA": _market_frame("AAA", dates[:5], np.arange(10.0, 15.0))})
+    handler = YFinanceHandler(cache_dir=str(tmp_path))
+    await handler.get_historical_closes(["AAA"], "2025-03-01", "2025-03-08")
+
+    # A 2:1 split after the cache was written halves every adjusted close
+    fake.histories["AAA"] = _market_frame("AAA", dates, np.arange(10.0, 18.0) / 2)
+    fake.calls.clear()
+    closes = await handler.get_historical_closes(["AAA"], "2025-03-01", "2025-03-13")
+
+    assert fake.calls == [
+        ("AAA", "2025-03-07", "2025-03-13"),
+        ("AAA", yfinance_handler.CACHE_START_DATE, "2025-03-13"),
+    ]
+    assert closes["AAA"].tolist() == list(np.arange(10.0, 18.0) / 2)
+
+@pytest.mark.asyncio
+async def test_multi_ticker_full_outer_join(tmp_path, fake_download):
+    """Tickers are aligned on the union of their dates, with NaN where one has no row."""
+    fake_download({
+        "AAA": _market_frame("AAA", WEEK[[0, 1, 2]], [1.0, 2.0, 3.0]),
+        "BBB": _market_frame("BBB", WEEK[[1, 2, 3, 4]], [20.0, 30.0, 40.0, 50.0]),
+    })
+    handler = YFinanceHandler(cache_dir=str(tmp_path))
+
+    closes = await handler.get_historical_closes(["AAA", "BBB"], "2025-03-01", "2025-03-08")
+
+    assert list(closes.columns) == ["AAA", "BBB"]
+    assert list(closes.index) == list(WEEK)
+    np.testing.assert_array_equal(closes["AAA"], [1.0, 2.0, 3.0, np.nan, np.nan])
+    np.testing.assert_array_equal(closes["BBB"], [np.nan, 20.0, 30.0, 40.0, 50.0])
+
+@pytest.mark.asyncio
+async def test_progress_callback_reports_fetch_and_load_stages(tmp_path, fake_download):
+    tickers = ["AAA", "BBB", "CCC"]
+    fake_download({t: _market_frame(t, WEEK, np.ones(5)) for t in tickers})
+    updates = []
+    handler = YFinanceHandler(cache_dir=str(tmp_path), status_callback=updates.append)
+
+    await handler.get_historical_closes(tickers, "2025-03-01", "2025-03-08")
+
+    fetching = [u for u in updates if u["stage"] == "Fetching"]
+    loading = [u for u in updates if u["stage"] == "Loading"]
+    assert sorted(u["ticker"] for u in fetching) == tickers
+    assert [u["current"] for u in fetching] == [1, 2, 3]
+    assert [(u["ticker"], u["current"], u["total"]) for u in loading] == [
+        ("AAA", 1, 3), ("BBB", 2, 3), ("CCC", 3, 3),
+    ]
+    assert all(u["module"] == "YFinanceHandler" for u in updates)
+
+@pytest.mark.asyncio
+async def test_downloads_share_one_semaphore(tmp_path, fake_download):
+    tickers = [f"T{i}" for i in range(10)]
+    fake = fake_download({t: _market_frame(t, WEEK, np.ones(5)) for t in tickers}, delay=0.05)
+    handler = YFinanceHandler(cache_dir=str(tmp_path))
+
+    closes = await handler.get_historical_closes(tickers, "2025-03-01", "2025-03-08")
+
+    assert len(fake.calls) == len(tickers)
+    assert 1 < fake.max_active <= 4
+    assert list(closes.columns) == tickers
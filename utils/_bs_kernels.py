@@ -0,0 +1,294 @@
+# utils/_bs_kernels.py
+"""
+Compiled Black-Scholes price and Greeks kernels shared by `utils.options_models`.
+
+The kernels are plain `math` code decorated with Numba's `njit`. When Numba is
+not installed the decorators are identities and the same functions run as
+ordinary Python, which is still cheaper than going through `scipy.stats.norm`.
+Option types are passed as a sign: +1.0 for calls, -1.0 for puts.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Identity stand-in for numba.njit, usable bare or with options."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# fastmath minus the no-NaN/no-Inf assumptions, so invalid inputs still produce NaN
+# (the P&L profile relies on that) and a vanishing Gamma denominator still gives inf
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+# Beyond |d| = 8 the normal tail (< 7e-16) is below double precision relative to 1,
+# so a price is its discounted intrinsic value and both CDF calls can be skipped
+_DEEP_MONEYNESS_D = 8.0
+
+_INV_SQRT_2 = 0.7071067811865476
+_INV_SQRT_2PI = 0.3989422804014327
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _norm_cdf(x: float) -> float:
+    """Standard normal CDF; erfc keeps full relative precision in the lower tail."""
+    return 0.5 * math.erfc(-x * _INV_SQRT_2)
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _d1_d2_nb(S: float, K: float, T: float, r: float, sigma: float, sigma_sqrt_T: float):
+    """d1 and d2 from a caller-computed sigma*sqrt(T), so each kernel takes one sqrt."""
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+    return d1, d1 - sigma_sqrt_T
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _bs_price_nb(S: float, K: float, T: float, r: float, sigma: float, phi: float) -> float:
+    """Black-Scholes price with the same edge-case handling as `black_scholes_price`."""
+    if T <= 1e-9:
+        return max(0.0, phi * (S - K))
+    discounted_K = K * math.exp(-r * T)
+    if sigma <= 1e-9:
+        return max(0.0, phi * (S - discounted_K))
+    if S <= 1e-9:
+        return 0.5 * (1.0 - phi) * discounted_K
+    if K <= 1e-9:
+        return 0.5 * (1.0 + phi) * S
+    sigma_sqrt_T = sigma * math.sqrt(T)
+    if abs(sigma_sqrt_T) < 1e-9:
+        return max(0.0, phi * (S - K))
+    d1, d2 = _d1_d2_nb(S, K, T, r, sigma, sigma_sqrt_T)
+    if d2 > _DEEP_MONEYNESS_D or d1 < -_DEEP_MONEYNESS_D: # d1 > d2, so both are deep on the same side
+        return max(0.0, phi * (S - discounted_K))
+    price = phi * (S * _norm_cdf(phi * d1) - discounted_K * _norm_cdf(phi * d2))
+    return max(0.0, price)
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _bs_greeks_nb(S: float, K: float, T: float, r: float, sigma: float, phi: float):
+    """
+    Delta, Gamma, Vega (per 1% IV), Theta (per day) and Rho (per 1% rate) for
+    S, K > 0 and T, sigma above the at-expiry / zero-vol thresholds.
+    """
+    sqrt_T = math.sqrt(T)
+    sigma_sqrt_T = sigma * sqrt_T
+    d1, d2 = _d1_d2_nb(S, K, T, r, sigma, sigma_sqrt_T)
+    n_d1 = _INV_SQRT_2PI * math.exp(-0.5 * d1 * d1)
+    N_phi_d1 = _norm_cdf(phi * d1)
+    N_phi_d2 = _norm_cdf(phi * d2)
+    discounted_K = K * math.exp(-r * T)
+
+    delta = phi * N_phi_d1 # N(d1) for calls, N(d1) - 1 for puts
+    gamma_denominator = S * sigma_sqrt_T
+    if abs(gamma_denominator) > 1e-9:
+        gamma = n_d1 / gamma_denominator
+    else:
+        gamma = math.inf if n_d1 > 1e-9 else 0.0
+    vega = S * n_d1 * sqrt_T / 100.0
+    theta = (-(S * n_d1 * sigma) / (2.0 * sqrt_T) - phi * r * discounted_K * N_phi_d2) / 365.0
+    rho = phi * discounted_K * T * N_phi_d2 / 100.0
+    return delta, gamma, vega, theta, rho
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _bs_price_vega_nb(S: float, K: float, T: float, r: float, sigma: float, phi: float):
+    """Closed-form price and raw Vega (dPrice/dsigma) sharing d1 and exp(-rT); needs S, K, T, sigma > 0."""
+    sqrt_T = math.sqrt(T)
+    sigma_sqrt_T = sigma * sqrt_T
+    d1, d2 = _d1_d2_nb(S, K, T, r, sigma, sigma_sqrt_T)
+    price = phi * (S * _norm_cdf(phi * d1) - K * math.exp(-r * T) * _norm_cdf(phi * d2))
+    vega = S * _INV_SQRT_2PI * math.exp(-0.5 * d1 * d1) * sqrt_T
+    return price, vega
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _iv_newton_nb(option_price: float, S: float, K: float, T: float, r: float, phi: float,
+                  low_vol: float, high_vol: float, tol: float, max_iter: int) -> float:
+    """
+    Newton-Raphson implied volatility from the Manaster-Koehler guess, the inflection
+    point of price in sigma, from which Newton converges monotonically. Returns NaN if
+    an iterate leaves [low_vol, high_vol], Vega vanishes, or it fails to converge.
+    """
+    sigma = math.sqrt(2.0 * abs(math.log(S / K) + r * T) / T)
+    sigma = min(max(sigma, low_vol), high_vol)
+    for _ in range(max_iter):
+        price, vega = _bs_price_vega_nb(S, K, T, r, sigma, phi)
+        if vega <= 1e-12:
+            return math.nan
+        step = (price - option_price) / vega
+        sigma -= step
+        if sigma < low_vol or sigma > high_vol:
+            return math.nan
+        if abs(step) < tol:
+            return sigma
+    return math.nan
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _iv_brent_nb(option_price: float, S: float, K: float, T: float, r: float, phi: float,
+                 low_vol: float, high_vol: float, f_low: float, f_high: float,
+                 xtol: float, rtol: float, max_iter: int):
+    """
+    Brent's method on BS(sigma) - option_price over [low_vol, high_vol], a port of
+    SciPy's brentq that reuses the caller's objective values at the bracket ends
+    instead of re-evaluating them. Returns (sigma, converged).
+    """
+    x_pre, x_cur = low_vol, high_vol
+    f_pre, f_cur = f_low, f_high
+    x_blk = f_blk = s_pre = s_cur = 0.0
+    if f_pre == 0.0:
+        return x_pre, True
+    if f_cur == 0.0:
+        return x_cur, True
+    for _ in range(max_iter):
+        if f_pre != 0.0 and f_cur != 0.0 and (f_pre < 0.0) != (f_cur < 0.0):
+            x_blk, f_blk = x_pre, f_pre
+            s_pre = s_cur = x_cur - x_pre
+        if abs(f_blk) < abs(f_cur):
+            x_pre, x_cur, x_blk = x_cur, x_blk, x_cur
+            f_pre, f_cur, f_blk = f_cur, f_blk, f_cur
+
+        delta = (xtol + rtol * abs(x_cur)) / 2.0
+        s_bis = (x_blk - x_cur) / 2.0
+        if f_cur == 0.0 or abs(s_bis) < delta:
+            return x_cur, True
+
+        if abs(s_pre) > delta and abs(f_cur) < abs(f_pre):
+            # A zero denominator gives an infinite trial step, i.e. bisection, as in IEEE C
+            s_try = math.inf
+            if x_pre == x_blk: # Secant interpolation
+                if f_cur != f_pre:
+                    s_try = -f_cur * (x_cur - x_pre) / (f_cur - f_pre)
+            elif x_pre != x_cur and x_blk != x_cur: # Inverse quadratic extrapolation
+                d_pre = (f_pre - f_cur) / (x_pre - x_cur)
+                d_blk = (f_blk - f_cur) / (x_blk - x_cur)
+                denominator = d_blk * d_pre * (f_blk - f_pre)
+                if denominator != 0.0:
+                    s_try = -f_cur * (f_blk * d_blk - f_pre * d_pre) / denominator
+            if 2.0 * abs(s_try) < min(abs(s_pre), 3.0 * abs(s_bis) - delta):
+                s_pre, s_cur = s_cur, s_try # Good short step
+            else:
+                s_pre = s_cur = s_bis # Bisect
+        else:
+            s_pre = s_cur = s_bis # Bisect
+
+        x_pre, f_pre = x_cur, f_cur
+        if abs(s_cur) > delta:
+            x_cur += s_cur
+        else:
+            x_cur += delta if s_bis > 0.0 else -delta
+        f_cur = _bs_price_nb(S, K, T, r, max(x_cur, 1e-7), phi) - option_price
+    return x_cur, False
+
+
+@njit(inline="always", fastmath=_FASTMATH, cache=True)
+def _leg_value_nb(S: float, K: float, phi: float, intrinsic: bool, T_back: float, r: float,
+                  sigma_back: float, sigma_sqrt_T: float, discount: float, drift: float,
+                  degenerate: bool) -> float:
+    """
+    Unclamped value of one P&L leg at stock price S: intrinsic phi * (S - K), or the
+    Black-Scholes price over the back-leg invariants hoisted by the caller (possibly NaN).
+    Inlined at the IR level, so the prange loop of `_pnl_profile_kernel` pays no call.
+    """
+    if intrinsic:
+        return phi * (S - K)
+    if degenerate: # Defer to the scalar kernel's edge-case order
+        return _bs_price_nb(S, K, T_back, r, sigma_back, phi)
+    if S <= 1e-9:
+        return 0.5 * (1.0 - phi) * K * discount
+    if K <= 1e-9:
+        return 0.5 * (1.0 + phi) * S
+    d1 = (math.log(S / K) + drift) / sigma_sqrt_T
+    d2 = d1 - sigma_sqrt_T
+    if d2 > _DEEP_MONEYNESS_D or d1 < -_DEEP_MONEYNESS_D:
+        return phi * (S - K * discount)
+    return phi * (S * _norm_cdf(phi * d1) - K * discount * _norm_cdf(phi * d2))
+
+
+@njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def _pnl_profile_kernel(S_arr: np.ndarray, K_arr: np.ndarray, phi_arr: np.ndarray, position_sizes: np.ndarray,
+                        intrinsic_mask: np.ndarray, T_back: float, r: float, sigma_back: float,
+                        total_cost: float, out: np.ndarray) -> int:
+    """
+    Fills `out` with the strategy P&L at each stock price, splitting prices across threads.
+    Legs flagged in `intrinsic_mask` are worth their intrinsic value; the rest are priced
+    with Black-Scholes over the shared back-leg T, r and sigma, so sqrt(T), exp(-rT) and
+    the d1 drift are computed once. NaN back-leg prices count as 0; returns how many there were.
+    """
+    sigma_sqrt_T = sigma_back * math.sqrt(T_back)
+    degenerate = T_back <= 1e-9 or sigma_back <= 1e-9 or abs(sigma_sqrt_T) < 1e-9
+    discount = math.exp(-r * T_back)
+    drift = (r + 0.5 * sigma_back * sigma_back) * T_back
+    nan_count = 0
+    for i in prange(S_arr.shape[0]):
+        S = S_arr[i]
+        position_value = 0.0
+        for j in range(K_arr.shape[0]):
+            leg_value = _leg_value_nb(S, K_arr[j], phi_arr[j], intrinsic_mask[j], T_back, r, sigma_back,
+                                      sigma_sqrt_T, discount, drift, degenerate)
+            if math.isnan(leg_value) and not intrinsic_mask[j]:
+                nan_count += 1
+                leg_value = 0.0
+            elif leg_value < 0.0: # NaN-propagating max(0, .) for intrinsic legs
+                leg_value = 0.0
+            position_value += position_sizes[j] * leg_value
+        out[i] = position_value - total_cost
+    return nan_count
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _position_value_nb(S: float, K_arr: np.ndarray, phi_arr: np.ndarray, position_sizes: np.ndarray,
+                       intrinsic_mask: np.ndarray, T_back: float, r: float, sigma_back: float,
+                       sigma_sqrt_T: float, discount: float, drift: float, degenerate: bool) -> float:
+    """
+    Value of all legs at one stock price, clamped as in `_pnl_profile_kernel`,
+    given the back-leg invariants hoisted by the caller.
+    """
+    position_value = 0.0
+    for j in range(K_arr.shape[0]):
+        leg_value = _leg_value_nb(S, K_arr[j], phi_arr[j], intrinsic_mask[j], T_back, r, sigma_back,
+                                  sigma_sqrt_T, discount, drift, degenerate)
+        if math.isnan(leg_value) and not intrinsic_mask[j]: # NaN back-leg prices count as 0
+            leg_value = 0.0
+        elif leg_value < 0.0:
+            leg_value = 0.0
+        position_value += position_sizes[j] * leg_value
+    return position_value
+
+
+@njit(fastmath=_FASTMATH, cache=True)
+def _pnl_breakeven_bisect_kernel(lo_bits: np.ndarray, hi_bits: np.ndarray, lo_negative: np.ndarray,
+                                 K_arr: np.ndarray, phi_arr: np.ndarray, position_sizes: np.ndarray,
+                                 intrinsic_mask: np.ndarray, T_back: float, r: float, sigma_back: float,
+                                 total_cost: float, out_bits: np.ndarray) -> None:
+    """
+    Compiled counterpart of `options_models._bisect_breakevens_bitwise`: bisects each
+    bracket's int64 bit patterns (of non-negative prices) down to adjacent doubles, with
+    the same P&L as `_pnl_profile_kernel`, and writes the end with non-negative P&L.
+    """
+    sigma_sqrt_T = sigma_back * math.sqrt(T_back)
+    degenerate = T_back <= 1e-9 or sigma_back <= 1e-9 or abs(sigma_sqrt_T) < 1e-9
+    discount = math.exp(-r * T_back)
+    drift = (r + 0.5 * sigma_back * sigma_back) * T_back
+    mid_price = np.empty(1)
+    mid_bits = mid_price.view(np.int64) # Aliases mid_price, reinterpreting its bits
+    for k in range(lo_bits.shape[0]):
+        lo, hi = lo_bits[k], hi_bits[k]
+        while hi - lo > 1:
+            mid_bits[0] = lo + (hi - lo) // 2
+            position_value = _position_value_nb(
+                mid_price[0], K_arr, phi_arr, position_sizes, intrinsic_mask, T_back, r, sigma_back,
+                sigma_sqrt_T, discount, drift, degenerate
+            )
+            if (position_value - total_cost < 0.0) == lo_negative[k]:
+                lo = mid_bits[0]
+            else:
+                hi = mid_bits[0]
+        out_bits[k] = hi if lo_negative[k] else lo
@@ -1,8 +1,26 @@
 # utils/logging_config.py
 import logging
 import sys
+import time
 from configs import ibkr_config
 
+class _SecondCachingFormatter(logging.Formatter):
+    """
+    Formatter that renders the date/time part of %(asctime)s once per second
+    instead of calling time.strftime for every record; output is unchanged.
+    """
+    _time_cache = (None, '') # (whole epoch second, formatted prefix), swapped as one tuple for thread safety
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt is not None:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, prefix = self._time_cache
+        if second != cached_second:
+            prefix = time.strftime(self.default_time_format, self.converter(record.created))
+            self._time_cache = (second, prefix)
+        return self.default_msec_format % (prefix, record.msecs)
+
 def setup_logging():
     """
     Configures the root logger for the entire application.
@@ -16,6 +34,12 @@ def setup_logging():
     # Use a format that includes the module name for clarity
     log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     
+    # The format uses none of the thread/process/task fields, so skip collecting them for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.logAsyncioTasks = False
+    
     # Get the root logger
     root_logger = logging.getLogger()
     
@@ -25,10 +49,10 @@ def setup_logging():
         
     # Add a stream handler to output to console
     handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(logging.Formatter(log_format))
+    handler.setFormatter(_SecondCachingFormatter(log_format))
     root_logger.addHandler(handler)
     
     # Set the level on the root logger
     root_logger.setLevel(log_level)
     
-    logging.info(f"Root logger configured with level: {ibkr_config.LOG_LEVEL}")
\ No newline at end of file
+    logging.info("Root logger configured with level: %s", ibkr_config.LOG_LEVEL)
\ No newline at end of file
@@ -2,86 +2,175 @@
 # Core financial formulas for options pricing, P&L, Implied Volatility, and Spread Analysis.
 
 import datetime
+import functools
+import math
 import numpy as np
-from scipy.stats import norm
-from scipy.optimize import brentq # For implied volatility calculation
+from numpy.typing import ArrayLike
+from scipy.special import ndtr # Standard normal CDF as a raw ufunc
+from scipy.optimize.elementwise import find_root # Vectorized Chandrupatla solver for batched IV
 import logging
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, NamedTuple, Union
+
+from utils._bs_kernels import (
+    _INV_SQRT_2PI,
+    _NUMBA_AVAILABLE as _BS_KERNELS_COMPILED,
+    _bs_greeks_nb,
+    _bs_price_nb,
+    _iv_brent_nb,
+    _iv_newton_nb,
+    _pnl_breakeven_bisect_kernel,
+    _pnl_profile_kernel
+)
+
+# Newton steps to try before falling back to Brent's method in implied_volatility
+_IV_NEWTON_MAX_ITER = 8
+
+# Highest volatility the IV solvers expand their upper bound to when high_vol cannot explain the price
+_IV_HIGH_VOL_CAP = 10.0
 
 # Logger for this module - will now inherit the central configuration
 logger = logging.getLogger(__name__)
 
-def black_scholes_price(S: float, K: float, T: float, r: float, sigma: float, option_type: str = "call") -> float:
+# Option type -> payoff sign (+1 call, -1 put)
+_OPTION_TYPE_SIGN = {"call": 1.0, "c": 1.0, "put": -1.0, "p": -1.0}
+
+class Greeks(NamedTuple):
+    """Black-Scholes Greeks for a batch of options, one array per Greek (see `calculate_greeks`)."""
+    delta: np.ndarray
+    gamma: np.ndarray
+    vega: np.ndarray
+    theta: np.ndarray
+    rho: np.ndarray
+
+def black_scholes_price(S: Union[float, np.ndarray], K: Union[float, np.ndarray], T: Union[float, np.ndarray],
+                        r: Union[float, np.ndarray], sigma: Union[float, np.ndarray],
+                        option_type: str = "call") -> Union[float, np.ndarray]:
     """
     Calculates the Black-Scholes option price.
 
     Args:
-        S: Current stock price.
-        K: Strike price.
-        T: Time to expiration in years.
-        r: Risk-free interest rate (annualized).
-        sigma: Implied volatility (annualized).
+        S: Current stock price, or a NumPy array of prices.
+        K: Strike price (or array).
+        T: Time to expiration in years (or array).
+        r: Risk-free interest rate (annualized, or array).
+        sigma: Implied volatility (annualized, or array).
         option_type: "call", "put", "c", or "p".
 
     Returns:
         The Black-Scholes price of the option, or np.nan if inputs are invalid.
+        Scalar results are memoized on the exact argument values, so repeated
+        sweeps over the same strikes/prices skip the pricing work. If any input
+        is a NumPy array, all inputs are broadcast and priced in one vectorized
+        pass, returning an array.
     """
+    if any(isinstance(x, np.ndarray) for x in (S, K, T, r, sigma)):
+        phi = _OPTION_TYPE_SIGN.get(option_type.lower())
+        if phi is None:
+            logger.error("BS Price Error: Invalid option type. Original input: '%s'.", option_type)
+            return np.full(np.broadcast(S, K, T, r, sigma).shape, np.nan)
+        return black_scholes_price_vec(S, K, T, r, sigma, is_call=phi > 0)
+
     try:
         # Ensure all inputs are floats for calculation
         S, K, T, r, sigma = float(S), float(K), float(T), float(r), float(sigma)
     except ValueError:
-        logger.warning(f"BS Price Error: Non-numeric input. S={S}, K={K}, T={T}, r={r}, sigma={sigma}")
+        logger.warning("BS Price Error: Non-numeric input. S=%s, K=%s, T=%s, r=%s, sigma=%s", S, K, T, r, sigma)
         return np.nan
 
-    opt_type_lower = option_type.lower()
+    # +1 for calls, -1 for puts: lets intrinsic values and the pricing formula share one branch-free expression
+    phi = _OPTION_TYPE_SIGN.get(option_type.lower())
+    if phi is None:
+        logger.error("BS Price Error: Invalid option type. Original input: '%s'.", option_type)
+        return np.nan
 
+    # Edge cases are logged here rather than in the memoized body, so they are reported on every call
+    if T <= 1e-9:
+        logger.debug("BS Price Info: T near zero (%.2e). Returning intrinsic value. S=%s, K=%s", T, S, K)
+    elif sigma <= 1e-9:
+        logger.debug("BS Price Info: Sigma near zero (%.2e). Returning discounted intrinsic. S=%s, K=%s, T=%s", sigma, S, K, T)
+    elif S <= 1e-9:
+        logger.debug("BS Price Info: S near zero (%.2e). K=%s, T=%s", S, K, T)
+    elif K <= 1e-9:
+        logger.debug("BS Price Info: K near zero (%.2e). S=%s, T=%s", K, S, T)
+    elif abs(sigma * math.sqrt(T)) < 1e-9:
+        logger.warning("BS Price Warning: d1_denominator (sigma*sqrt(T)) near zero: %s. S=%s, K=%s, T=%s, sigma=%s. Returning intrinsic.", sigma * math.sqrt(T), S, K, T, sigma)
+
+    return _black_scholes_price_cached(S, K, T, r, sigma, phi)
+
+@functools.lru_cache(maxsize=8192)
+def _black_scholes_price_cached(S: float, K: float, T: float, r: float, sigma: float, phi: float) -> float:
+    """
+    Memoized body of black_scholes_price. Inputs must already be Python floats
+    and `phi` the option sign; edge cases are logged by the caller.
+    """
     # Handle edge case: Time to expiration is zero or negligible
     if T <= 1e-9:
-        logger.debug(f"BS Price Info: T near zero ({T:.2e}). Returning intrinsic value. S={S}, K={K}")
-        return max(0.0, S - K) if opt_type_lower in ["call", "c"] else max(0.0, K - S)
+        return max(0.0, phi * (S - K))
+
+    discounted_K = K * math.exp(-r * T)
 
     # Handle edge case: Volatility is zero or negligible
     if sigma <= 1e-9:
-        logger.debug(f"BS Price Info: Sigma near zero ({sigma:.2e}). Returning discounted intrinsic. S={S}, K={K}, T={T}")
-        if opt_type_lower in ["call", "c"]:
-            return max(0.0, S - K * np.exp(-r * T))
-        elif opt_type_lower in ["put", "p"]:
-            return max(0.0, K * np.exp(-r * T) - S)
-        else:
-            logger.error(f"BS Price Error (sigma=0): Invalid option type. Original: '{option_type}'.")
-            return np.nan
+        return max(0.0, phi * (S - discounted_K))
 
     # Handle edge cases for stock price or strike price being zero or negative
-    if S <= 1e-9: # Stock price is zero or negative
-        logger.debug(f"BS Price Info: S near zero ({S:.2e}). K={K}, T={T}")
-        return K * np.exp(-r * T) if opt_type_lower in ["put", "p"] else 0.0
-    if K <= 1e-9: # Strike price is zero or negative
-        logger.debug(f"BS Price Info: K near zero ({K:.2e}). S={S}, T={T}")
-        return S if opt_type_lower in ["call", "c"] else 0.0
-
-
-    d1_denominator = sigma * np.sqrt(T)
-    if abs(d1_denominator) < 1e-9:
-        logger.warning(f"BS Price Warning: d1_denominator (sigma*sqrt(T)) near zero: {d1_denominator}. S={S}, K={K}, T={T}, sigma={sigma}. Returning intrinsic.")
-        return max(0.0, S - K) if opt_type_lower in ["call", "c"] else max(0.0, K - S)
-
-    d1_val = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / d1_denominator
-    d2_val = d1_val - sigma * np.sqrt(T)
-
-    if opt_type_lower == "call" or opt_type_lower == "c":
-        price = S * norm.cdf(d1_val) - K * np.exp(-r * T) * norm.cdf(d2_val)
-    elif opt_type_lower == "put" or opt_type_lower == "p":
-        price = K * np.exp(-r * T) * norm.cdf(-d2_val) - S * norm.cdf(-d1_val)
-    else:
-        logger.error(f"BS Price Error: Invalid option type. Original input: '{option_type}'.")
-        return np.nan
+    if S <= 1e-9: # Stock price is zero or negative: a put is worth the discounted strike, a call nothing
+        return 0.5 * (1.0 - phi) * discounted_K
+    if K <= 1e-9: # Strike price is zero or negative: a call is worth the stock, a put nothing
+        return 0.5 * (1.0 + phi) * S
 
-    return max(0.0, price) # Ensure price is not negative
+    if abs(sigma * math.sqrt(T)) < 1e-9: # d1 denominator near zero
+        return max(0.0, phi * (S - K))
+
+    # Call: S*N(d1) - K*e^(-rT)*N(d2); Put: K*e^(-rT)*N(-d2) - S*N(-d1), in compiled code
+    return _bs_price_nb(S, K, T, r, sigma, phi)
+
+def black_scholes_price_vec(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike,
+                            is_call: Union[bool, ArrayLike] = True) -> np.ndarray:
+    """
+    Calculates Black-Scholes prices for arrays of options in a single vectorized pass.
+
+    All inputs broadcast against each other, so a grid of stock prices can be priced
+    against one strike, or a whole chain at once. Edge cases (T, sigma, S or K near
+    zero) are resolved with masks and match `black_scholes_price`.
+
+    Args:
+        S: Current stock price(s).
+        K: Strike price(s).
+        T: Time(s) to expiration in years.
+        r: Risk-free interest rate(s) (annualized).
+        sigma: Implied volatility(ies) (annualized).
+        is_call: True for calls, False for puts. A scalar or a boolean array.
+
+    Returns:
+        An array of Black-Scholes prices with the broadcast shape of the inputs.
+    """
+    S, K, T, r, sigma = (np.asarray(x, dtype=np.float64) for x in (S, K, T, r, sigma))
+    phi = np.where(np.asarray(is_call, dtype=bool), 1.0, -1.0) # +1 call, -1 put
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        sigma_sqrt_T = sigma * np.sqrt(T)
+        discounted_K = K * np.exp(-r * T)
+        d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+
+        # One CDF evaluation per d for calls and puts alike
+        price = phi * (S * ndtr(phi * d1) - discounted_K * ndtr(phi * d2))
+
+        # Edge cases are applied lowest-priority first so the scalar function's check order wins
+        intrinsic = np.maximum(phi * (S - K), 0.0)
+        price = np.where(np.abs(sigma_sqrt_T) < 1e-9, intrinsic, price)
+        price = np.where(K <= 1e-9, 0.5 * (1.0 + phi) * S, price)
+        price = np.where(S <= 1e-9, 0.5 * (1.0 - phi) * discounted_K, price)
+        price = np.where(sigma <= 1e-9, np.maximum(phi * (S - discounted_K), 0.0), price)
+        price = np.where(T <= 1e-9, intrinsic, price)
+
+    return np.maximum(price, 0.0) # Ensure price is not negative
 
 def implied_volatility(option_price: float, S: float, K: float, T: float, r: float, option_type: str = "call",
                        low_vol: float = 1e-5, high_vol: float = 3.0, tol: float = 1e-6, max_iter: int = 100) -> float:
     """
-    Calculates implied volatility using Brent's method.
+    Calculates implied volatility using Newton-Raphson, falling back to Brent's method.
 
     Args:
         option_price: Market price of the option.
@@ -99,42 +188,37 @@ def implied_volatility(option_price: float, S: float, K: float, T: float, r: flo
         The implied volatility, or np.nan if calculation fails.
     """
     if T <= 1e-9: # Time to expiration is zero or negative
-        logger.debug(f"IV Warning: Time to expiration is zero or negative (T={T:.2e}). S={S}, K={K}, Px={option_price}. Returning NaN.")
+        logger.debug("IV Warning: Time to expiration is zero or negative (T=%.2e). S=%s, K=%s, Px=%s. Returning NaN.", T, S, K, option_price)
         return np.nan
 
-    is_call = option_type.lower() in ["call", "c"]
-    is_put = option_type.lower() in ["put", "p"]
-
-    if not (is_call or is_put):
-        logger.error(f"IV Error: Invalid option_type '{option_type}' passed to implied_volatility.")
+    phi = _OPTION_TYPE_SIGN.get(option_type.lower()) # +1 call, -1 put
+    if phi is None:
+        logger.error("IV Error: Invalid option_type '%s' passed to implied_volatility.", option_type)
         return np.nan
 
     # If option price is very low for an OTM option, IV is likely very low.
     if option_price < tol: # Using tol as a threshold for "near zero" price
-        if (is_call and S < K) or (is_put and S > K): # Out-of-the-money
-             logger.debug(f"IV Info: OTM option price is near zero ({option_price:.4f}). S={S}, K={K}, T={T:.4f}. Returning low_vol ({low_vol}).")
+        if phi * (S - K) < 0: # Out-of-the-money
+             logger.debug("IV Info: OTM option price is near zero (%.4f). S=%s, K=%s, T=%.4f. Returning low_vol (%s).", option_price, S, K, T, low_vol)
              return low_vol
 
-    opt_type_normalized = "call" if is_call else "put"
+    opt_type_normalized = "call" if phi > 0 else "put"
 
-    # Objective function for Brent's method: difference between BS price and market price
+    # Objective function for the bracket checks: difference between BS price and market price.
+    # The option type is resolved to phi once above, so each evaluation goes straight to the kernel.
     def objective_function(sigma_obj: float) -> float:
         if sigma_obj < 1e-7: sigma_obj = 1e-7 # Ensure sigma is positive for BS calculation
-        return black_scholes_price(S, K, T, r, sigma_obj, opt_type_normalized) - option_price
+        return _bs_price_nb(S, K, T, r, sigma_obj, phi) - option_price
 
     try:
+        option_price, S, K, T, r = float(option_price), float(S), float(K), float(T), float(r)
+        low_vol, high_vol, tol = float(low_vol), float(high_vol), float(tol)
+
         # Check for arbitrage: option price must be >= discounted intrinsic value
-        intrinsic_discounted = 0.0
-        if opt_type_normalized == "call":
-            intrinsic_discounted = max(0.0, S - K * np.exp(-r * T))
-            if option_price < intrinsic_discounted - tol: # Allow for small tolerance
-                logger.warning(f"IV Warning (Call): Price {option_price:.4f} < Discounted Intrinsic {intrinsic_discounted:.4f}. S={S}, K={K}, T={T:.4f}, r={r}. Returning low_vol.")
-                return low_vol
-        else: # Put option
-            intrinsic_discounted = max(0.0, K * np.exp(-r * T) - S)
-            if option_price < intrinsic_discounted - tol:
-                logger.warning(f"IV Warning (Put): Price {option_price:.4f} < Discounted Intrinsic {intrinsic_discounted:.4f}. S={S}, K={K}, T={T:.4f}, r={r}. Returning low_vol.")
-                return low_vol
+        intrinsic_discounted = max(0.0, phi * (S - K * math.exp(-r * T)))
+        if option_price < intrinsic_discounted - tol: # Allow for small tolerance
+            logger.warning("IV Warning (%s): Price %.4f < Discounted Intrinsic %.4f. S=%s, K=%s, T=%.4f, r=%s. Returning low_vol.", opt_type_normalized.capitalize(), option_price, intrinsic_discounted, S, K, T, r)
+            return low_vol
 
         # Evaluate objective function at the bounds
         val_at_low_vol = objective_function(low_vol)
@@ -142,64 +226,160 @@ def implied_volatility(option_price: float, S: float, K: float, T: float, r: flo
 
         # If root is already at one of the bounds
         if abs(val_at_low_vol) < tol:
-            logger.debug(f"IV Info: Root found near low_vol ({low_vol}). S={S}, K={K}, T={T:.4f}, Px={option_price}")
+            logger.debug("IV Info: Root found near low_vol (%s). S=%s, K=%s, T=%.4f, Px=%s", low_vol, S, K, T, option_price)
             return low_vol
         if abs(val_at_high_vol) < tol:
-            logger.debug(f"IV Info: Root found near high_vol ({high_vol}). S={S}, K={K}, T={T:.4f}, Px={option_price}")
+            logger.debug("IV Info: Root found near high_vol (%s). S=%s, K=%s, T=%.4f, Px=%s", high_vol, S, K, T, option_price)
             return high_vol
 
         # If objective function has the same sign at both bounds, Brent's method may fail.
         # This can happen if the option price is outside the range achievable by varying IV within [low_vol, high_vol].
         if val_at_low_vol * val_at_high_vol > 0:
             logger.warning(
-                f"IV Solver Issue: Objective function has same sign at bounds [{low_vol}, {high_vol}]. "
-                f"Params: OptPx={option_price:.4f}, S={S:.2f}, K={K:.2f}, T={T:.4f}, r={r:.4f}, Type={opt_type_normalized}. "
-                f"f(low_vol={low_vol})={val_at_low_vol:.4f}, f(high_vol={high_vol})={val_at_high_vol:.4f}"
+                "IV Solver Issue: Objective function has same sign at bounds [%s, %s]. "
+                "Params: OptPx=%.4f, S=%.2f, K=%.2f, T=%.4f, r=%.4f, Type=%s. "
+                "f(low_vol=%s)=%.4f, f(high_vol=%s)=%.4f",
+                low_vol, high_vol, option_price, S, K, T, r, opt_type_normalized,
+                low_vol, val_at_low_vol, high_vol, val_at_high_vol
             )
             # Attempt to expand high_vol if market price is higher than BS at high_vol (val_at_high_vol < 0)
             if val_at_high_vol < 0:
-                original_high_vol = high_vol
-                for i in range(1, 4): # Try expanding a few times
-                    expanded_high_vol = original_high_vol * (2**i)
-                    if expanded_high_vol > 10.0 : expanded_high_vol = 10.0 # Cap expansion to a very high IV
-                    val_at_expanded_high = objective_function(expanded_high_vol)
-                    logger.debug(f"IV Solver: Expanding high_vol to {expanded_high_vol:.2f}, f()={val_at_expanded_high:.4f}")
-                    if val_at_low_vol * val_at_expanded_high < 0: # Found a bracket
-                        high_vol = expanded_high_vol # Update high_vol for brentq
-                        logger.info(f"IV Solver: Found bracket with expanded high_vol={high_vol:.2f}")
-                        break
-                    if expanded_high_vol >= 10.0: break # Stop if max expansion reached
-                # Check again after expansion attempt
-                if val_at_low_vol * objective_function(high_vol) > 0:
+                # BS prices rise monotonically with sigma, so one evaluation at the cap
+                # decides whether any expansion can bracket the root
+                if high_vol >= _IV_HIGH_VOL_CAP:
+                    logger.warning("IV Solver: high_vol is already at the expansion cap. Returning NaN.")
+                    return np.nan
+                val_at_expanded_high = objective_function(_IV_HIGH_VOL_CAP)
+                logger.debug("IV Solver: Expanding high_vol to %.2f, f()=%.4f", _IV_HIGH_VOL_CAP, val_at_expanded_high)
+                if val_at_low_vol * val_at_expanded_high > 0:
                     logger.warning("IV Solver: Still same sign after expanding high_vol. Returning NaN.")
                     return np.nan
+                high_vol, val_at_high_vol = _IV_HIGH_VOL_CAP, val_at_expanded_high # Update the bracket for the solvers
+                logger.info("IV Solver: Found bracket with expanded high_vol=%.2f", high_vol)
             # If market price is lower than BS price even at low_vol (val_at_low_vol > 0)
             elif val_at_low_vol > 0:
-                 logger.warning(f"IV Solver: Market price {option_price:.4f} is below BS price at low_vol ({low_vol}). Returning low_vol.")
+                 logger.warning("IV Solver: Market price %.4f is below BS price at low_vol (%s). Returning low_vol.", option_price, low_vol)
                  return low_vol
             else: # Other unhandled same-sign cases
                 logger.warning("IV Solver: Unhandled same-sign scenario. Returning NaN.")
                 return np.nan
 
-        # Use Brent's method to find the root (implied volatility)
-        iv = brentq(objective_function, low_vol, high_vol, xtol=tol, rtol=tol, maxiter=max_iter)
-        
-        # Clamp IV to the search bounds just in case brentq slightly overshoots due to tolerance
+        # A bracket exists: Newton from the Manaster-Koehler guess usually converges in a
+        # few steps; Brent's method is the fallback if it leaves the bracket or stalls.
+        if S > 0 and K > 0:
+            iv = _iv_newton_nb(option_price, S, K, T, r, phi, low_vol, high_vol, tol, _IV_NEWTON_MAX_ITER)
+            if not math.isnan(iv):
+                return iv
+            logger.debug("IV Solver: Newton did not converge for Px=%s, S=%s, K=%s, T=%.4f. Falling back to Brent.", option_price, S, K, T)
+
+        # Use Brent's method to find the root (implied volatility), reusing the bound evaluations
+        iv, converged = _iv_brent_nb(option_price, S, K, T, r, phi, low_vol, high_vol,
+                                     val_at_low_vol, val_at_high_vol, tol, tol, max_iter)
+        if not converged:
+            logger.error("IV Error (Brent did not converge in %s iterations) for Px=%s, S=%s, K=%s, T=%s, r=%s, Type=%s", max_iter, option_price, S, K, T, r, opt_type_normalized)
+            return np.nan
+
+        # Clamp IV to the search bounds just in case Brent slightly overshoots due to tolerance
         if iv < low_vol: iv = low_vol
         if iv > high_vol: iv = high_vol
         return iv
 
-    except ValueError as e: # Error from brentq if bounds are invalid or other issues
-        logger.error(f"IV Error (Brentq ValueError): {e} for Px={option_price}, S={S}, K={K}, T={T}, r={r}, Type={opt_type_normalized}")
-        return np.nan
-    except RuntimeError as e: # Typically "failed to converge" from brentq
-        logger.error(f"IV Error (Brentq RuntimeError - max_iter likely): {e} for Px={option_price}, S={S}, K={K}, T={T}, r={r}, Type={opt_type_normalized}")
+    except ValueError as e: # Non-numeric inputs or other invalid values
+        logger.error("IV Error (ValueError): %s for Px=%s, S=%s, K=%s, T=%s, r=%s, Type=%s", e, option_price, S, K, T, r, opt_type_normalized)
         return np.nan
     except Exception as e_unhandled: # Catch any other unexpected errors
-        logger.error(f"IV Error (Unhandled Exception): {e_unhandled} for Px={option_price}, S={S}, K={K}, T={T}, r={r}, Type={opt_type_normalized}", exc_info=True)
+        logger.error("IV Error (Unhandled Exception): %s for Px=%s, S=%s, K=%s, T=%s, r=%s, Type=%s", e_unhandled, option_price, S, K, T, r, opt_type_normalized, exc_info=True)
         return np.nan
 
 
+def implied_volatility_vec(option_prices: ArrayLike, S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                           is_call: Union[bool, ArrayLike] = True, low_vol: float = 1e-5, high_vol: float = 3.0,
+                           tol: float = 1e-6, max_iter: int = 100) -> np.ndarray:
+    """
+    Calculates implied volatilities for a batch of options with a vectorized root finder.
+
+    Applies the same bounds handling as `implied_volatility` to every option, then
+    solves all bracketed options at once with Chandrupatla's method, so a whole
+    chain costs one vectorized Black-Scholes evaluation per iteration instead of
+    one Python solver per option.
+
+    Args:
+        option_prices: Market price(s) of the options.
+        S: Current stock price(s).
+        K: Strike price(s).
+        T: Time(s) to expiration in years.
+        r: Risk-free interest rate(s) (annualized).
+        is_call: True for calls, False for puts. A scalar or a boolean array.
+        low_vol: Lower bound for IV search.
+        high_vol: Upper bound for IV search.
+        tol: Tolerance for the IV solver.
+        max_iter: Maximum iterations for the IV solver.
+
+    Returns:
+        An array of implied volatilities with the broadcast shape of the inputs;
+        np.nan where no volatility could be found.
+    """
+    option_prices, S, K, T, r, is_call = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (option_prices, S, K, T, r)), np.asarray(is_call, dtype=bool)
+    )
+    iv = np.full(option_prices.shape, np.nan)
+    unresolved = T > 1e-9 # Expired options have no implied volatility
+
+    def objective(sigma: np.ndarray, price: np.ndarray, S: np.ndarray, K: np.ndarray, T: np.ndarray,
+                  r: np.ndarray, is_call: np.ndarray) -> np.ndarray:
+        return black_scholes_price_vec(S, K, T, r, np.maximum(sigma, 1e-7), is_call) - price
+
+    # Near-zero OTM prices, and prices below the discounted intrinsic value, imply the minimum volatility
+    phi = np.where(is_call, 1.0, -1.0)
+    with np.errstate(over='ignore'):
+        intrinsic_discounted = np.maximum(phi * (S - K * np.exp(-r * T)), 0.0)
+    floor_mask = unresolved & (((option_prices < tol) & (phi * (S - K) < 0)) | (option_prices < intrinsic_discounted - tol))
+    iv[floor_mask] = low_vol
+    unresolved &= ~floor_mask
+
+    args = (option_prices, S, K, T, r, is_call)
+    val_at_low_vol = np.full(iv.shape, np.nan)
+    val_at_high_vol = np.full(iv.shape, np.nan)
+    val_at_low_vol[unresolved] = objective(low_vol, *(a[unresolved] for a in args))
+    val_at_high_vol[unresolved] = objective(high_vol, *(a[unresolved] for a in args))
+
+    # Roots at a bound, or a market price below the BS price even at low_vol
+    for bound_mask, value in ((np.abs(val_at_low_vol) < tol, low_vol),
+                              (np.abs(val_at_high_vol) < tol, high_vol),
+                              (val_at_low_vol > 0, low_vol)):
+        mask = unresolved & bound_mask
+        iv[mask] = value
+        unresolved &= ~mask
+
+    # Market price above the BS price at high_vol: one evaluation at the cap decides
+    # whether any larger upper bound can bracket the root (BS is monotone in sigma)
+    upper = np.full(iv.shape, high_vol)
+    expand = unresolved & (val_at_high_vol < 0)
+    if expand.any() and high_vol < _IV_HIGH_VOL_CAP:
+        upper[expand] = _IV_HIGH_VOL_CAP
+        val_at_high_vol[expand] = objective(upper[expand], *(a[expand] for a in args))
+    unresolved &= ~(val_at_high_vol < 0) # Still no bracket: left as NaN
+    unresolved &= ~np.isnan(val_at_high_vol)
+
+    if unresolved.any():
+        result = find_root(
+            objective, (np.full(int(unresolved.sum()), low_vol), upper[unresolved]),
+            args=tuple(a[unresolved] for a in args),
+            tolerances=dict(xatol=tol, xrtol=tol), maxiter=max_iter,
+        )
+        if not np.all(result.success):
+            logger.warning("IV Solver: %d of %d options failed to converge. Returning NaN for them.",
+                           int(np.sum(~result.success)), result.success.size)
+        iv[unresolved] = np.where(result.success, np.clip(result.x, low_vol, upper[unresolved]), np.nan)
+
+    return iv
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_datetime_cached(date_str: str, date_format: str) -> datetime.datetime:
+    """Memoized strptime; strategies are re-evaluated with the same few expiry strings."""
+    return datetime.datetime.strptime(date_str, date_format)
+
 def calculate_time_to_expiration_in_years(expiration_date_str: str, valuation_date_str: Optional[str] = None) -> float:
     """
     Calculates the time to expiration in years from a given valuation date.
@@ -216,19 +396,19 @@ def calculate_time_to_expiration_in_years(expiration_date_str: str, valuation_da
         ValueError: If date strings are not in the correct format.
     """
     try:
-        exp_date = datetime.datetime.strptime(expiration_date_str, "%Y-%m-%d").date()
+        exp_date = _parse_datetime_cached(expiration_date_str, "%Y-%m-%d").date()
     except ValueError:
-        logger.error(f"TTE Error: Invalid expiration_date_str format: '{expiration_date_str}'. Expected YYYY-MM-DD.")
+        logger.error("TTE Error: Invalid expiration_date_str format: '%s'. Expected YYYY-MM-DD.", expiration_date_str)
         raise 
 
     if valuation_date_str:
         try:
-            val_date = datetime.datetime.strptime(valuation_date_str, "%Y-%m-%d").date()
+            val_date = _parse_datetime_cached(valuation_date_str, "%Y-%m-%d").date()
         except ValueError:
-            logger.error(f"TTE Error: Invalid valuation_date_str format: '{valuation_date_str}'. Expected YYYY-MM-DD.")
+            logger.error("TTE Error: Invalid valuation_date_str format: '%s'. Expected YYYY-MM-DD.", valuation_date_str)
             raise
     else:
-        val_date = datetime.date.today()
+        val_date = datetime.date.today() # Not cached: today moves
 
     if exp_date <= val_date:
         return 1e-9  # Effectively zero or past, return a very small positive number to avoid division by zero in BS
@@ -237,33 +417,6 @@ def calculate_time_to_expiration_in_years(expiration_date_str: str, valuation_da
     return (exp_date - val_date).days / 365.25
 
 
-def _d1(S: float, K: float, T: float, r: float, sigma: float) -> float:
-    """Helper function to calculate d1 for Black-Scholes."""
-    if T <= 1e-9 or sigma <= 1e-9: return np.nan # Avoid issues with zero T or sigma
-    if S <= 0 or K <= 0: return np.nan # log(S/K) undefined or problematic
-
-    d1_denominator_val = sigma * np.sqrt(T)
-    if abs(d1_denominator_val) < 1e-9: # Avoid division by zero
-        logger.warning(f"d1 calc: denominator sigma*np.sqrt(T) is near zero ({d1_denominator_val}). S={S}, K={K}, T={T}, sigma={sigma}")
-        return np.nan 
-    return (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / d1_denominator_val
-
-def _d2(S: float, K: float, T: float, r: float, sigma: float) -> float:
-    """Helper function to calculate d2 for Black-Scholes."""
-    if T <= 1e-9 or sigma <= 1e-9: return np.nan # Consistent with _d1 check
-
-    d1_val = _d1(S, K, T, r, sigma)
-    if np.isnan(d1_val): return np.nan # Propagate NaN if d1 failed
-
-    sigma_sqrt_T = sigma * np.sqrt(T)
-    # If sigma*sqrt(T) is extremely small, d2 is effectively d1.
-    # This check avoids issues if d1 is large and sigma*sqrt(T) is ~0, which could lead to large d2.
-    if abs(sigma_sqrt_T) < 1e-9 and abs(d1_val) > 1e-6 : # Check if d1 is significant
-         logger.debug(f"d2 calc: sigma*sqrt(T) is near zero ({sigma_sqrt_T}) but d1 is not ({d1_val}). Returning d1 for d2.")
-         return d1_val # d2 approaches d1 as sigma*sqrt(T) approaches 0
-    return d1_val - sigma_sqrt_T
-
-
 def calculate_greeks(S: float, K: float, T: float, r: float, sigma: float, option_type: str = 'call') -> Dict[str, float]:
     """
     Calculates Black-Scholes Greeks for a European option (Delta, Gamma, Vega, Theta, Rho).
@@ -280,19 +433,16 @@ def calculate_greeks(S: float, K: float, T: float, r: float, sigma: float, optio
         A dictionary containing the calculated greeks. Values can be np.nan if calculation is not possible.
     """
     greeks = { 'delta': np.nan, 'gamma': np.nan, 'vega': np.nan, 'theta': np.nan, 'rho': np.nan }
-    opt_type_lower = option_type.lower()
-
-    if opt_type_lower not in ["call", "c", "put", "p"]:
-        logger.error(f"Greeks Error: Invalid option_type '{option_type}'")
+    phi = _OPTION_TYPE_SIGN.get(option_type.lower()) # +1 call, -1 put
+    if phi is None:
+        logger.error("Greeks Error: Invalid option_type '%s'", option_type)
         return greeks
 
     # Handle At Expiration (T is very small)
     if T <= 1e-6:
-        logger.debug(f"Greeks Info: T near zero ({T:.2e}). Calculating greeks at expiration. S={S}, K={K}")
-        if opt_type_lower in ["call", "c"]: 
-            greeks['delta'] = 1.0 if S > K else (0.5 if S == K else 0.0)
-        elif opt_type_lower in ["put", "p"]: 
-            greeks['delta'] = -1.0 if S < K else (-0.5 if S == K else 0.0)
+        logger.debug("Greeks Info: T near zero (%.2e). Calculating greeks at expiration. S=%s, K=%s", T, S, K)
+        # Calls: 1 ITM, 0.5 ATM, 0 OTM; puts the same with a negative sign
+        greeks['delta'] = 0.5 * phi if S == K else (phi if phi * (S - K) > 0 else 0.0)
         # Gamma is theoretically infinite ATM, zero otherwise. Often treated as 0 or very large.
         greeks['gamma'] = 0.0 # Or np.inf if S == K, but 0 is common simplification
         greeks['vega'] = 0.0 # No time for volatility to have an effect
@@ -302,13 +452,10 @@ def calculate_greeks(S: float, K: float, T: float, r: float, sigma: float, optio
 
     # Handle Zero Volatility (sigma is very small)
     if sigma <= 1e-6:
-        logger.debug(f"Greeks Info: Sigma near zero ({sigma:.2e}). Calculating greeks for zero volatility. S={S}, K={K}, T={T}")
+        logger.debug("Greeks Info: Sigma near zero (%.2e). Calculating greeks for zero volatility. S=%s, K=%s, T=%s", sigma, S, K, T)
         # Delta becomes a step function based on discounted intrinsic value
-        discounted_K = K * np.exp(-r * T)
-        if opt_type_lower in ["call", "c"]: 
-            greeks['delta'] = 1.0 if S > discounted_K else (0.5 if S == discounted_K else 0.0)
-        elif opt_type_lower in ["put", "p"]: 
-            greeks['delta'] = -1.0 if S < discounted_K else (-0.5 if S == discounted_K else 0.0)
+        discounted_K = K * math.exp(-r * T)
+        greeks['delta'] = 0.5 * phi if S == discounted_K else (phi if phi * (S - discounted_K) > 0 else 0.0)
         greeks['vega'] = 0.0 # No sensitivity to vol if vol is zero
         # Gamma, Theta, Rho are problematic (often infinite at strike or zero). Return NaNs or zeros.
         greeks['gamma'] = np.nan # Or 0.0 / np.inf
@@ -316,65 +463,94 @@ def calculate_greeks(S: float, K: float, T: float, r: float, sigma: float, optio
         greeks['rho'] = np.nan   # Or 0.0
         return greeks
 
-    d1_val = _d1(S, K, T, r, sigma)
-    d2_val = _d2(S, K, T, r, sigma)
-
-    if np.isnan(d1_val) or np.isnan(d2_val):
-        logger.warning(f"Greeks Warning: d1 ({d1_val}) or d2 ({d2_val}) is NaN. S={S}, K={K}, T={T}, r={r}, sigma={sigma}. Cannot calculate greeks.")
+    if S <= 0 or K <= 0: # log(S/K) undefined, so d1 and d2 are too
+        logger.warning("Greeks Warning: d1 and d2 are undefined. S=%s, K=%s, T=%s, r=%s, sigma=%s. Cannot calculate greeks.", S, K, T, r, sigma)
         return greeks # Return dict with NaNs
 
-    N_d1 = norm.cdf(d1_val)
-    N_d2 = norm.cdf(d2_val)
-    n_d1 = norm.pdf(d1_val) # phi(d1), normal probability density function
-
-    # Delta
-    if opt_type_lower in ["call", "c"]: 
-        greeks['delta'] = N_d1
-    elif opt_type_lower in ["put", "p"]: 
-        greeks['delta'] = N_d1 - 1.0
-
-    # Gamma
-    if S > 0 and sigma > 0 and T > 0: # Denominator checks for gamma: S * sigma * sqrt(T)
-        gamma_denominator = S * sigma * np.sqrt(T)
-        if abs(gamma_denominator) > 1e-9:
-            greeks['gamma'] = n_d1 / gamma_denominator
-        else:
-            logger.warning(f"Greeks Warning (Gamma): Denominator S*sigma*sqrt(T) near zero ({gamma_denominator}). S={S}, sigma={sigma}, T={T}")
-            # Gamma can be very large if ATM and denominator is small
-            greeks['gamma'] = np.inf if n_d1 > 1e-9 else 0.0 
-    else:
-        greeks['gamma'] = np.nan # If S, sigma, or T is zero/negative
+    greeks['delta'], greeks['gamma'], greeks['vega'], greeks['theta'], greeks['rho'] = _bs_greeks_nb(S, K, T, r, sigma, phi)
+    return greeks
 
-    # Vega (per 1% change in IV)
-    greeks['vega'] = S * n_d1 * np.sqrt(T) / 100.0
 
-    # Theta (per day)
-    # Common theta formula: -(S * n_d1 * sigma) / (2 * sqrt(T)) -/+ r * K * exp(-rT) * N(+/-d2)
-    # The sign of the second term depends on call/put
-    term1_theta = (S * n_d1 * sigma) / (2 * np.sqrt(T)) if T > 1e-9 else 0 # Avoid division by zero if T is tiny
-    
-    if opt_type_lower in ["call", "c"]:
-        term2_theta_call = r * K * np.exp(-r * T) * N_d2
-        theta_val = -term1_theta - term2_theta_call
-    elif opt_type_lower in ["put", "p"]:
-        N_minus_d2 = norm.cdf(-d2_val) # N(-d2)
-        term2_theta_put = r * K * np.exp(-r * T) * N_minus_d2
-        theta_val = -term1_theta + term2_theta_put
-    else: # Should not happen due to earlier check
-        theta_val = np.nan
-    greeks['theta'] = theta_val / 365.0 # Convert annualized theta to per day
-
-    # Rho (per 1% change in r)
-    if opt_type_lower in ["call", "c"]:
-        greeks['rho'] = K * T * np.exp(-r * T) * N_d2 / 100.0
-    elif opt_type_lower in ["put", "p"]:
-        N_minus_d2 = norm.cdf(-d2_val) # N(-d2)
-        greeks['rho'] = -K * T * np.exp(-r * T) * N_minus_d2 / 100.0
-    else: # Should not happen
-        greeks['rho'] = np.nan
+def calculate_greeks_vec(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike,
+                         is_call: Union[bool, ArrayLike] = True) -> Greeks:
+    """
+    Calculates Black-Scholes Greeks for arrays of options in a single vectorized pass.
 
-    return greeks
+    Inputs broadcast like `black_scholes_price_vec`, and the results (units and
+    at-expiration / zero-volatility handling) match `calculate_greeks` element by element.
 
+    Args:
+        S: Current stock price(s).
+        K: Strike price(s).
+        T: Time(s) to expiration in years.
+        r: Risk-free interest rate(s) (annualized).
+        sigma: Implied volatility(ies) (annualized).
+        is_call: True for calls, False for puts. A scalar or a boolean array.
+
+    Returns:
+        A Greeks tuple of arrays with the broadcast shape of the inputs.
+    """
+    S, K, T, r, sigma = (np.asarray(x, dtype=np.float64) for x in (S, K, T, r, sigma))
+    phi = np.where(np.asarray(is_call, dtype=bool), 1.0, -1.0) # +1 call, -1 put
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        sqrt_T = np.sqrt(T)
+        sigma_sqrt_T = sigma * sqrt_T
+        discount = np.exp(-r * T)
+        d1 = (np.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+        n_d1 = _INV_SQRT_2PI * np.exp(-0.5 * d1 * d1)
+        N_phi_d1 = ndtr(phi * d1)
+        N_phi_d2 = ndtr(phi * d2)
+
+        delta = phi * N_phi_d1
+        gamma_denominator = S * sigma_sqrt_T
+        gamma = np.where(np.abs(gamma_denominator) > 1e-9, n_d1 / gamma_denominator, np.where(n_d1 > 1e-9, np.inf, 0.0))
+        vega = S * n_d1 * sqrt_T / 100.0
+        theta = (-(S * n_d1 * sigma) / (2.0 * sqrt_T) - phi * r * K * discount * N_phi_d2) / 365.0
+        rho = phi * K * T * discount * N_phi_d2 / 100.0
+
+        # Edge cases are applied lowest-priority first so calculate_greeks' check order wins
+        undefined = (S <= 0) | (K <= 0) # log(S/K) undefined
+        delta, gamma, vega, theta, rho = (np.where(undefined, np.nan, g) for g in (delta, gamma, vega, theta, rho))
+
+        zero_vol = sigma <= 1e-6
+        discounted_K = K * discount
+        zero_vol_delta = np.where(S == discounted_K, 0.5 * phi, np.where(phi * (S - discounted_K) > 0, phi, 0.0))
+        delta = np.where(zero_vol, zero_vol_delta, delta)
+        vega = np.where(zero_vol, 0.0, vega)
+        gamma, theta, rho = (np.where(zero_vol, np.nan, g) for g in (gamma, theta, rho))
+
+        expired = T <= 1e-6
+        expiry_delta = np.where(S == K, 0.5 * phi, np.where(phi * (S - K) > 0, phi, 0.0))
+        delta = np.where(expired, expiry_delta, delta)
+        gamma, vega, theta, rho = (np.where(expired, 0.0, g) for g in (gamma, vega, theta, rho))
+
+    return Greeks(delta, gamma, vega, theta, rho)
+
+
+def _bisect_breakevens_bitwise(pnl_at: Callable[[np.ndarray], np.ndarray], lo: np.ndarray, hi: np.ndarray,
+                               pnl_lo: np.ndarray) -> np.ndarray:
+    """
+    Refines P&L zero crossings bracketed by [lo, hi] (non-negative prices, with the
+    P&L changing between negative and non-negative across each bracket) to adjacent
+    doubles. Non-negative doubles order like their int64 bit patterns, so bisecting
+    the patterns halves the number of representable prices left per step: at most
+    63 vectorized P&L evaluations for all brackets together, whatever the grid spacing.
+
+    Returns the bracket end at which the P&L is non-negative, i.e. the exact
+    breakeven price to within one ulp.
+    """
+    lo_bits, hi_bits = lo.view(np.int64).copy(), hi.view(np.int64).copy()
+    lo_negative = pnl_lo < 0
+    active = hi_bits - lo_bits > 1
+    while active.any():
+        mid_bits = lo_bits[active] + (hi_bits[active] - lo_bits[active]) // 2
+        mid_on_lo_side = (pnl_at(mid_bits.view(np.float64)) < 0) == lo_negative[active]
+        lo_bits[active] = np.where(mid_on_lo_side, mid_bits, lo_bits[active])
+        hi_bits[active] = np.where(mid_on_lo_side, hi_bits[active], mid_bits)
+        active = hi_bits - lo_bits > 1
+    return np.where(lo_negative, hi_bits.view(np.float64), lo_bits.view(np.float64))
 
 def generate_pl_profile_at_front_expiry(
     strategy_legs_data: List[Dict[str, Any]],
@@ -410,24 +586,26 @@ def generate_pl_profile_at_front_expiry(
 
     Returns:
         A dictionary containing:
-            'stock_prices': List of stock prices used for the profile.
-            'pnl_values': List of corresponding P&L values.
+            'stock_prices': Array of stock prices used for the profile (the input array).
+            'pnl_values': Array of corresponding P&L values. Both stay NumPy arrays so
+                          large grids skip boxing every float into a Python list;
+                          call .tolist() at a JSON boundary if one needs plain lists.
             'total_debit': The net cost to establish the spread.
             'max_potential_profit': Maximum profit found within the given stock price range.
             'breakeven_points': List of estimated stock prices where P&L is zero.
         Returns None if a critical error occurs during calculation.
     """
     module_name_for_callback = "FinancialCalculations_PL" 
-    def _log_status_fc(msg_type: str, message: str):
-        """Internal helper for logging and status callback."""
+    def _log_status_fc(msg_type: str, message: str, *args: Any):
+        """Internal helper for logging and status callback. `args` are %-formatted into `message` only when needed."""
         if status_callback:
-            status_callback({"module": module_name_for_callback, "type": msg_type, "message": message})
+            status_callback({"module": module_name_for_callback, "type": msg_type, "message": message % args if args else message})
         
-        # Also log to module logger
-        if msg_type == "error": logger.error(message)
-        elif msg_type == "warning": logger.warning(message)
-        elif msg_type == "debug": logger.debug(message)
-        else: logger.info(message)
+        # Also log to module logger, which skips formatting for filtered levels
+        if msg_type == "error": logger.error(message, *args)
+        elif msg_type == "warning": logger.warning(message, *args)
+        elif msg_type == "debug": logger.debug(message, *args)
+        else: logger.info(message, *args)
 
     _log_status_fc("info", "Calculating P&L profile for spread strategy...")
 
@@ -439,6 +617,11 @@ def generate_pl_profile_at_front_expiry(
         return None
 
 
+    # Strip timezones once: the calculation point is precisely the (naive) front month expiry
+    front_exp_naive = front_month_exp_datetime.replace(tzinfo=None)
+    back_exp_naive = back_month_exp_datetime.replace(tzinfo=None)
+    eval_date = front_exp_naive.date()
+
     total_initial_cost = 0.0 # Can be debit (positive) or credit (negative)
     parsed_legs = []
 
@@ -452,13 +635,13 @@ def generate_pl_profile_at_front_expiry(
             expiry_str = str(leg_data['expiry']) # YYYYMMDD
 
             if opt_type not in ['C', 'P']:
-                _log_status_fc("error", f"Invalid option type '{opt_type}' for leg {i}.")
+                _log_status_fc("error", "Invalid option type '%s' for leg %d.", opt_type, i)
                 return None
             if action not in ['BUY', 'SELL']:
-                _log_status_fc("error", f"Invalid action '{action}' for leg {i}.")
+                _log_status_fc("error", "Invalid action '%s' for leg %d.", action, i)
                 return None
             if quantity <= 0:
-                _log_status_fc("error", f"Quantity must be positive for leg {i}, got {quantity}.")
+                _log_status_fc("error", "Quantity must be positive for leg %d, got %d.", i, quantity)
                 return None
 
             cost_of_leg = initial_price * quantity * 100 # Standard 100 multiplier
@@ -473,27 +656,21 @@ def generate_pl_profile_at_front_expiry(
                 'type': opt_type,
                 'action': action,
                 'quantity': quantity,
-                'expiry_dt': datetime.datetime.strptime(expiry_str, "%Y%m%d") # Store as datetime
+                # Expiring at or before the P&L calculation point, decided once per leg
+                'expired_at_front': _parse_datetime_cached(expiry_str, "%Y%m%d").date() <= eval_date
             })
         except (KeyError, ValueError, TypeError) as e:
-            _log_status_fc("error", f"Missing, invalid, or wrong type of data for leg {i}: {e}. Leg data: {leg_data}")
+            _log_status_fc("error", "Missing, invalid, or wrong type of data for leg %d: %s. Leg data: %s", i, e, leg_data)
             return None
     
-    pnl_values_list = []
-
-    # Ensure naive datetime objects for comparison if timezone info is present but not consistent
-    # The calculation point is precisely at front_month_exp_datetime
-    eval_datetime_naive = front_month_exp_datetime.replace(tzinfo=None) if front_month_exp_datetime.tzinfo else front_month_exp_datetime
-    
     # Calculate TTE for the back leg from the perspective of the front leg's expiry
     # This is the time remaining for the back leg when the front leg expires.
     T_remaining_back_leg = 0.0
-    if back_month_exp_datetime > front_month_exp_datetime:
-        bm_exp_dt_naive = back_month_exp_datetime.replace(tzinfo=None) if back_month_exp_datetime.tzinfo else back_month_exp_datetime
-        time_diff_seconds = (bm_exp_dt_naive - eval_datetime_naive).total_seconds()
+    if back_exp_naive > front_exp_naive:
+        time_diff_seconds = (back_exp_naive - front_exp_naive).total_seconds()
         # Consider a full day for TTE if expiring on the same day but later time, or future days.
         # If precisely at expiry, TTE is effectively zero unless there's an intraday component not modeled here.
-        # For simplicity, if bm_exp_dt_naive is on the same day as eval_datetime_naive, TTE is near zero.
+        # For simplicity, if back_exp_naive is on the same day as front_exp_naive, TTE is near zero.
         # If it's a future day, calculate days / 365.25
         if time_diff_seconds > 0 : # Back month expires after front month evaluation point
              # More precise TTE using total_seconds for partial days, though typically whole days are used for DTE.
@@ -501,83 +678,95 @@ def generate_pl_profile_at_front_expiry(
              # Let's assume front_month_exp_datetime is the exact moment of expiry.
             T_remaining_back_leg = max(0.0, time_diff_seconds / (365.25 * 24 * 60 * 60))
 
-    elif back_month_exp_datetime < front_month_exp_datetime:
+    elif back_exp_naive < front_exp_naive:
         _log_status_fc("error", "Back month expiry is before front month expiry. Invalid for calendar-like spread P&L at front expiry.")
         return None
     # If back_month_exp_datetime == front_month_exp_datetime, T_remaining_back_leg remains 0.0
 
-    _log_status_fc("debug", f"Time remaining for back leg at front expiry: {T_remaining_back_leg:.4f} years.")
-
-    for S_at_expiry in stock_price_range:
-        value_of_position_at_front_expiry = 0.0
-        for leg in parsed_legs:
-            K_leg = leg['strike']
-            opt_type_leg = leg['type']
-            action_leg = leg['action']
-            qty_leg = leg['quantity']
-            multiplier = 100 
-
-            leg_val_at_front_exp = 0.0
-
-            # If the leg's expiry is on or before the front month's evaluation datetime
-            if leg['expiry_dt'].date() <= eval_datetime_naive.date():
-                # This leg expires at or before the P&L calculation point. Its value is intrinsic.
-                if opt_type_leg == 'C':
-                    leg_val_at_front_exp = max(0, S_at_expiry - K_leg)
-                elif opt_type_leg == 'P':
-                    leg_val_at_front_exp = max(0, K_leg - S_at_expiry)
-            else: # This is a longer-dated leg (back-month leg)
-                if T_remaining_back_leg > 1e-9: # If there's significant time left
-                    # Value it using Black-Scholes with the assumed IV and remaining TTE
-                    # Ensure S_at_expiry is used as the underlying price for this BS calculation
-                    bs_price_back_leg = black_scholes_price(
-                        S=S_at_expiry, K=K_leg, T=T_remaining_back_leg,
-                        r=risk_free_rate, sigma=assumed_iv_for_back_leg_at_front_expiry,
-                        option_type=opt_type_leg
-                    )
-                    if np.isnan(bs_price_back_leg):
-                        _log_status_fc("warning", f"BS price for back leg (S={S_at_expiry}, K={K_leg}, T={T_remaining_back_leg:.4f}, IV={assumed_iv_for_back_leg_at_front_expiry:.3f}) returned NaN. Assuming 0 value for this leg at this stock price.")
-                        leg_val_at_front_exp = 0.0 # Default to 0 if BS fails
-                    else:
-                        leg_val_at_front_exp = bs_price_back_leg
-                else: # No significant time left for the back leg either (e.g., T_remaining_back_leg is 0)
-                     if opt_type_leg == 'C': leg_val_at_front_exp = max(0, S_at_expiry - K_leg)
-                     elif opt_type_leg == 'P': leg_val_at_front_exp = max(0, K_leg - S_at_expiry)
-            
-            # Add or subtract leg value based on action (BUY/SELL)
-            if action_leg == 'BUY':
-                value_of_position_at_front_expiry += leg_val_at_front_exp * qty_leg * multiplier
-            elif action_leg == 'SELL':
-                value_of_position_at_front_expiry -= leg_val_at_front_exp * qty_leg * multiplier
-        
-        pnl_at_s = value_of_position_at_front_expiry - total_initial_cost
-        pnl_values_list.append(pnl_at_s)
-
-    pnl_values_np = np.array(pnl_values_list)
+    _log_status_fc("debug", "Time remaining for back leg at front expiry: %.4f years.", T_remaining_back_leg)
+
+    # Legs as parallel arrays (strike, +/-1 type sign, signed contract size) so every
+    # leg is valued across the whole stock price range in one (n_legs, n_prices) pass
+    multiplier = 100
+    strikes = np.array([leg['strike'] for leg in parsed_legs], dtype=np.float64)
+    phis = np.array([1.0 if leg['type'] == 'C' else -1.0 for leg in parsed_legs])
+    position_sizes = np.array([leg['quantity'] * multiplier * (1 if leg['action'] == 'BUY' else -1) for leg in parsed_legs],
+                              dtype=np.float64)
+    # Legs expiring at or before the P&L calculation point, or back legs with no
+    # significant time left, are worth their intrinsic value.
+    intrinsic_mask = np.array([leg['expired_at_front'] for leg in parsed_legs])
+    intrinsic_mask |= T_remaining_back_leg <= 1e-9
+
+    def _evaluate_pnl(prices: np.ndarray):
+        """Strategy P&L at each of `prices` and the number of NaN back-leg prices treated as 0."""
+        if _BS_KERNELS_COMPILED:
+            # Value every leg and sum the position in one parallel pass over the stock prices
+            pnl = np.empty_like(prices)
+            nan_count = _pnl_profile_kernel(
+                prices, strikes, phis, position_sizes, intrinsic_mask, T_remaining_back_leg,
+                risk_free_rate, assumed_iv_for_back_leg_at_front_expiry, total_initial_cost, pnl
+            )
+            return pnl, nan_count
+        leg_values = np.empty((len(parsed_legs), prices.size))
+        leg_values[intrinsic_mask] = np.maximum(phis[intrinsic_mask, None] * (prices - strikes[intrinsic_mask, None]), 0.0)
+        back_mask = ~intrinsic_mask
+        nan_count = 0
+        if back_mask.any(): # Back-month legs: Black-Scholes with the assumed IV and remaining TTE
+            back_values = black_scholes_price_vec(
+                prices, strikes[back_mask, None], T_remaining_back_leg,
+                risk_free_rate, assumed_iv_for_back_leg_at_front_expiry, is_call=phis[back_mask, None] > 0
+            )
+            nan_mask = np.isnan(back_values)
+            back_values[nan_mask] = 0.0 # Default to 0 if BS fails
+            leg_values[back_mask] = back_values
+            nan_count = int(nan_mask.sum())
+        # Add or subtract leg values based on action (BUY/SELL) in a single weighted sum
+        return position_sizes @ leg_values - total_initial_cost, nan_count
+
+    prices = np.ascontiguousarray(stock_price_range, dtype=np.float64)
+    pnl_values_np, nan_count = _evaluate_pnl(prices)
+
+    if nan_count:
+        _log_status_fc("warning", "BS price for back legs (T=%.4f, IV=%.3f) returned NaN at %d (leg, stock price) point(s). Assuming 0 value for those legs at those prices.", T_remaining_back_leg, assumed_iv_for_back_leg_at_front_expiry, nan_count)
     max_potential_profit = np.max(pnl_values_np) if pnl_values_np.size > 0 else 0.0
     
     # Calculate breakeven points by finding where P&L crosses zero
-    breakeven_points = []
+    breakeven_points = np.empty(0)
     if pnl_values_np.size > 1 and stock_price_range.size == pnl_values_np.size:
-        for i in range(len(stock_price_range) - 1):
-            pnl1, pnl2 = pnl_values_np[i], pnl_values_np[i+1]
-            s1, s2 = stock_price_range[i], stock_price_range[i+1]
-            
-            # Check if P&L crosses zero between s1 and s2
-            if (pnl1 < 0 and pnl2 >= 0) or (pnl1 >= 0 and pnl2 < 0):
-                if abs(pnl2 - pnl1) > 1e-9: # Avoid division by zero if P&L is flat
-                    # Linear interpolation to find the stock price at P&L = 0
-                    breakeven_stock_price = s1 - pnl1 * (s2 - s1) / (pnl2 - pnl1)
-                    breakeven_points.append(breakeven_stock_price)
-                elif abs(pnl1) < 1e-9 : # pnl1 is (close to) zero
-                    breakeven_points.append(s1)
-                # (pnl2 being zero is caught by the next iteration's pnl1)
-
-    _log_status_fc("info", f"P&L profile calculated. Initial Cost: {total_initial_cost:.2f}, Max Profit (in range): {max_potential_profit:.2f}")
+        # Indices i where P&L changes between negative and non-negative from s[i] to s[i+1]
+        is_negative, is_non_negative = pnl_values_np < 0, pnl_values_np >= 0
+        crossings = np.flatnonzero((is_negative[:-1] & is_non_negative[1:]) | (is_non_negative[:-1] & is_negative[1:]))
+        pnl1, pnl2 = pnl_values_np[crossings], pnl_values_np[crossings + 1]
+        s1, s2 = prices[crossings], prices[crossings + 1]
+        pnl_step = pnl2 - pnl1
+        sloped = np.abs(pnl_step) > 1e-9 # Avoid division by zero if P&L is flat
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Linear interpolation to find the stock price at P&L = 0
+            interpolated = s1 - pnl1 * (s2 - s1) / pnl_step
+        # Interpolation is only as good as the grid spacing on a curved P&L; bisect the
+        # true P&L inside each sloped bracket of finite, non-negative prices instead
+        lo, hi = np.minimum(s1, s2) + 0.0, np.maximum(s1, s2) # + 0.0 turns -0.0 into 0.0 for the bit view
+        refinable = sloped & (lo >= 0) & np.isfinite(hi)
+        if refinable.any():
+            lo, hi, pnl_lo = lo[refinable], hi[refinable], np.where(s1 <= s2, pnl1, pnl2)[refinable]
+            if _BS_KERNELS_COMPILED:
+                refined = np.empty_like(lo)
+                _pnl_breakeven_bisect_kernel(
+                    lo.view(np.int64), hi.view(np.int64), pnl_lo < 0, strikes, phis, position_sizes, intrinsic_mask,
+                    T_remaining_back_leg, risk_free_rate, assumed_iv_for_back_leg_at_front_expiry, total_initial_cost,
+                    refined.view(np.int64)
+                )
+            else:
+                refined = _bisect_breakevens_bitwise(lambda p: _evaluate_pnl(p)[0], lo, hi, pnl_lo)
+            interpolated[refinable] = refined
+        # A flat step only counts if pnl1 is (close to) zero; pnl2 being zero is caught by the next crossing's pnl1
+        breakeven_points = np.where(sloped, interpolated, s1)[sloped | (np.abs(pnl1) < 1e-9)]
+
+    _log_status_fc("info", "P&L profile calculated. Initial Cost: %.2f, Max Profit (in range): %.2f", total_initial_cost, max_potential_profit)
     return {
-        "stock_prices": stock_price_range.tolist(), # Convert numpy array to list for JSON compatibility if needed
-        "pnl_values": pnl_values_np.tolist(),
+        "stock_prices": stock_price_range,
+        "pnl_values": pnl_values_np,
         "total_initial_cost": total_initial_cost, # Renamed from total_debit for clarity (can be credit)
         "max_potential_profit": max_potential_profit,
-        "breakeven_points": sorted(list(set(bp for bp in breakeven_points if not np.isnan(bp)))) # Remove NaNs and duplicates
+        "breakeven_points": np.unique(breakeven_points[~np.isnan(breakeven_points)]).tolist() # Sorted, without NaNs or duplicates
     }
@@ -5,6 +5,7 @@ performance metrics, such as Sharpe Ratio, Sortino Ratio, Max Drawdown, etc.
 """
 
 import logging
+import math
 import numpy as np
 import pandas as pd
 from typing import Union, Any
@@ -12,8 +13,56 @@ from typing import Union, Any
 # Inherits the central logging configuration
 logger = logging.getLogger(__name__)
 
-# Define a more specific type hint for a series or array of floats
-NumericSeriesOrArray = Union[pd.Series[float], np.ndarray[Any, np.dtype[np.float64]]]
+# Numba is an optional accelerator; the NumPy path is used when it is not installed.
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+# Define a more specific type hint for a series or array of floats.
+# pd.Series is quoted: it only supports subscripting in the pandas-stubs, not at runtime.
+NumericSeriesOrArray = Union["pd.Series[float]", np.ndarray[Any, np.dtype[np.float64]]]
+
+if _NUMBA_AVAILABLE:
+    # reassoc lets LLVM vectorize the two sums; NaN/Inf flags are left off so a NaN return still yields NaN
+    @njit(fastmath={"reassoc", "contract"}, cache=True)
+    def _excess_return_stats_kernel(returns: np.ndarray, periodic_risk_free_rate: float):
+        """
+        Mean and population standard deviation of `returns - periodic_risk_free_rate`
+        without materializing the excess returns. The second pass sums squared
+        deviations from the mean, which stays accurate when the mean dwarfs the spread.
+        """
+        n = returns.shape[0]
+        total = 0.0
+        for i in range(n):
+            total += returns[i]
+        mean_return = total / n
+        squared_deviations = 0.0
+        for i in range(n):
+            deviation = returns[i] - mean_return
+            squared_deviations += deviation * deviation
+        return mean_return - periodic_risk_free_rate, math.sqrt(squared_deviations / n)
+
+    # error_model="numpy" keeps IEEE semantics (inf/NaN) for a zero high-water mark
+    @njit(cache=True, error_model="numpy")
+    def _max_drawdown_kernel(equity_curve: np.ndarray) -> float:
+        """
+        Running high-water mark and worst drawdown tracked as scalars in one pass,
+        with no temporary arrays. A NaN anywhere makes the result NaN, as in NumPy.
+        """
+        high_water_mark = equity_curve[0]
+        max_drawdown = math.inf
+        for i in range(equity_curve.shape[0]):
+            value = equity_curve[i]
+            if value > high_water_mark:
+                high_water_mark = value
+            drawdown = (value - high_water_mark) / high_water_mark
+            if math.isnan(drawdown):
+                return math.nan
+            if drawdown < max_drawdown:
+                max_drawdown = drawdown
+        return max_drawdown
 
 
 def calculate_sharpe_ratio(
@@ -31,20 +80,31 @@ def calculate_sharpe_ratio(
         periods_per_year (int): The number of trading periods in a year.
 
     Returns:
-        float: The annualized Sharpe Ratio.
+        float: The annualized Sharpe Ratio. NaN returns in a Series are skipped,
+            as pandas does; a NaN in a NumPy array makes the result NaN.
     """
     periodic_risk_free_rate: float = (1 + risk_free_rate)**(1 / periods_per_year) - 1
-    excess_returns: NumericSeriesOrArray = returns - periodic_risk_free_rate
-    
-    # FIX: Explicitly convert the NumPy float type to a standard Python float.
-    std_dev_returns: float = float(np.std(excess_returns))
+
+    if isinstance(returns, pd.Series):
+        # Keep pandas' skipna semantics (e.g. the leading NaN of pct_change()) on both paths
+        returns = returns.dropna()
+
+    returns_array = np.ascontiguousarray(returns, dtype=np.float64)
+    if _NUMBA_AVAILABLE and returns_array.ndim == 1 and returns_array.size > 0:
+        # Fused mean/std of the excess returns with no temporary array
+        mean_excess_return, std_dev_returns = _excess_return_stats_kernel(returns_array, periodic_risk_free_rate)
+    else:
+        excess_returns: NumericSeriesOrArray = returns - periodic_risk_free_rate
+        # FIX: Explicitly convert the NumPy float type to a standard Python float.
+        std_dev_returns = float(np.std(excess_returns))
+        mean_excess_return = float(np.mean(excess_returns))
     
     if std_dev_returns == 0:
         logger.warning("Standard deviation of returns is zero. Cannot calculate Sharpe Ratio. Returning 0.0.")
         return 0.0
         
     # FIX: Explicitly convert the result of the calculation to a standard Python float.
-    sharpe_ratio_periodic: float = float(np.mean(excess_returns) / std_dev_returns)
+    sharpe_ratio_periodic: float = float(mean_excess_return / std_dev_returns)
     annualized_sharpe_ratio: float = sharpe_ratio_periodic * np.sqrt(periods_per_year)
     
     return float(annualized_sharpe_ratio)
@@ -61,8 +121,18 @@ def calculate_max_drawdown(
             NumPy array representing the portfolio's value over time.
 
     Returns:
-        float: The Maximum Drawdown as a negative decimal.
+        float: The Maximum Drawdown as a negative decimal. NaN values in a Series
+            are skipped, as pandas does; a NaN in a NumPy array makes the result NaN.
     """
+    if isinstance(equity_curve, pd.Series):
+        # Skip gaps so the running peak carries across them on both paths
+        equity_curve = equity_curve.dropna()
+
+    if _NUMBA_AVAILABLE:
+        equity_array = np.ascontiguousarray(equity_curve, dtype=np.float64)
+        if equity_array.ndim == 1 and equity_array.size > 0:
+            return float(_max_drawdown_kernel(equity_array))
+
     high_water_mark: NumericSeriesOrArray = np.maximum.accumulate(equity_curve)
     drawdown: NumericSeriesOrArray = (equity_curve - high_water_mark) / high_water_mark
     
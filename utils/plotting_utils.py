@@ -3,19 +3,28 @@
 This file contains generic, reusable functions for creating Matplotlib plots.
 These functions return Figure objects and are not tied to any specific GUI framework.
 """
-import matplotlib.pyplot as plt
 import numpy as np
 from typing import Dict, Any, Optional
 
+from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 
+def _reuse_or_add_axes(fig: Figure) -> Axes:
+    """Returns the figure's first Axes cleared for redrawing, adding one if it has none."""
+    if not fig.axes:
+        return fig.add_subplot(111)
+    ax = fig.axes[0]
+    ax.clear()
+    return ax
+
 def create_pnl_figure(
     strategy_details: Dict[str, Any],
     ticker_symbol: str,
     current_price: float,
     lower_2_sigma_target: Optional[float],
     upper_2_sigma_target: Optional[float],
-    currency: str = "$"
+    currency: str = "$",
+    fig: Optional[Figure] = None
 ) -> Figure: # FIX: Use the directly imported Figure type
     """
     Creates a Matplotlib Figure object for a strategy's P&L curve.
@@ -30,21 +39,34 @@ def create_pnl_figure(
         lower_2_sigma_target (Optional[float]): The lower 2-sigma price target.
         upper_2_sigma_target (Optional[float]): The upper 2-sigma price target.
         currency (str): The currency symbol to use.
+        fig (Optional[Figure]): A figure from a previous call to redraw in place.
+            Its axes are cleared and reused, so an interactive caller can keep
+            one figure (and the canvas embedding it) alive across replots.
 
     Returns:
-        matplotlib.figure.Figure: The generated Matplotlib figure.
+        matplotlib.figure.Figure: The generated Matplotlib figure. It is not
+            registered with pyplot; render it with `fig.savefig` or embed it
+            in a backend canvas (e.g. FigureCanvasTkAgg(fig, master)).
     """
-    s_values = np.array(strategy_details.get("s_values_for_plot", []))
-    pnl_values = np.array(strategy_details.get("pnl_values_for_plot", []))
-
-    # FIX: Add type: ignore to suppress informational warnings on complex library functions
-    fig, ax = plt.subplots(figsize=(8, 5)) # type: ignore
+    # asarray skips the copy when the caller already passes float64 arrays (e.g. from the P&L profile)
+    s_values = np.asarray(strategy_details.get("s_values_for_plot", []), dtype=np.float64)
+    pnl_values = np.asarray(strategy_details.get("pnl_values_for_plot", []), dtype=np.float64)
 
     if s_values.size == 0 or pnl_values.size == 0:
+        if fig is None:
+            # Placeholder figures carry only a text label, so a low DPI is enough
+            fig = Figure(figsize=(8, 5), dpi=72)
+        ax = _reuse_or_add_axes(fig)
         ax.text(0.5, 0.5, "No plotting data available.", ha='center', va='center', fontsize=12, color='red') # type: ignore
         ax.set_title(f"{ticker_symbol} - Strategy P&L") # type: ignore
         return fig
 
+    if fig is None:
+        # A bare Figure is not registered with pyplot's global figure manager, so it is
+        # thread-safe to build and is freed when the caller drops it (no plt.close needed)
+        fig = Figure(figsize=(8, 5))
+    ax = _reuse_or_add_axes(fig)
+
     # --- Plotting logic ---
     ax.plot(s_values, pnl_values, label="P&L at Front Expiry", color="blue", linewidth=1.5) # type: ignore
     ax.axhline(y=0, color='black', linestyle='-', linewidth=0.7) # type: ignore
@@ -1,7 +1,32 @@
 # utils/polygon_utils.py
 import datetime
-from typing import Union
-
+import functools
+import re
+from typing import List, Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Precompiled validators and format for option symbols, hoisted out of the per-call path
+_EXPIRATION_DATE_MATCH = re.compile(r"\d{6}", re.ASCII).fullmatch
+# Case-insensitive option type -> Polygon code; a miss (None) means the type is invalid
+_OPTION_TYPE_CODES = {"C": "C", "P": "P", "c": "C", "p": "P"}
+_OPTION_SYMBOL_FORMAT = "O:%s%s%s%08d"
+_OPTION_SYMBOL_SUFFIX_FORMAT = "%s%s%08d" # prefix "O:<ticker><expiry>", type code, scaled strike
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_NS_PER_SECOND = 1_000_000_000
+_SECONDS_PER_DAY = 86_400
+
+_TICKER_PREFIXES = {
+    'stocks': '',
+    'indices': 'I:',
+    'crypto': 'X:', # Crypto uses 'X:' prefix
+    'forex': 'C:'   # Forex uses 'C:' prefix
+}
+
+# Option chain refreshes format the same (ticker, expiry, type, strike) tuples over and over
+@functools.lru_cache(maxsize=65536)
 def format_polygon_option_symbol(underlying_ticker: str, expiration_date_str: str, option_type: str, strike_price: float) -> str:
     """
     Formats an option symbol into the standard Polygon.io format.
@@ -17,31 +42,85 @@ def format_polygon_option_symbol(underlying_ticker: str, expiration_date_str: st
         strike_price (float): The strike price of the option. Must be a positive number.
 
     Returns:
-        str: The formatted Polygon.io option symbol.
+        str: The formatted Polygon.io option symbol. Results are memoized, so a
+             repeated symbol is a cache lookup; invalid inputs are not cached.
 
     Raises:
         ValueError: If any input parameters are invalid.
     """
     # FIX: Pylance knows this is a string from the type hint, so the isinstance check is removed.
-    if not underlying_ticker.strip():
+    ticker = underlying_ticker.strip()
+    if not ticker:
         raise ValueError("Underlying ticker must be a non-empty string.")
     
-    # FIX: Redundant isinstance check removed.
-    if not (len(expiration_date_str) == 6 and expiration_date_str.isdigit()):
+    if _EXPIRATION_DATE_MATCH(expiration_date_str) is None:
         raise ValueError(f"Expiration date string must be 6 digits (YYMMDD), got: '{expiration_date_str}'")
         
-    processed_option_type = option_type.upper()
-    if processed_option_type not in ['C', 'P']:
+    processed_option_type = _OPTION_TYPE_CODES.get(option_type)
+    if processed_option_type is None:
         raise ValueError(f"Option type must be 'C' or 'P', got: '{option_type}'")
     
     # FIX: Redundant isinstance check removed. The type hint already specifies float.
     if strike_price <= 0:
         raise ValueError(f"Strike price must be a positive number, got: {strike_price}")
 
-    strike_as_int_scaled = int(strike_price * 1000)
-    strike_formatted = str(strike_as_int_scaled).zfill(8)
-    
-    return f"O:{underlying_ticker.upper().strip()}{expiration_date_str}{processed_option_type}{strike_formatted}"
+    # Round rather than truncate: e.g. 2.01 * 1000 == 2009.9999999999998
+    return _OPTION_SYMBOL_FORMAT % (ticker.upper(), expiration_date_str, processed_option_type, round(strike_price * 1000))
+
+
+def format_polygon_option_symbols(underlying_ticker: str, expiration_date_str: str,
+                                  option_types: Union[str, Sequence[str]], strike_prices: ArrayLike) -> List[str]:
+    """
+    Formats a whole chain of option symbols for one underlying and expiration.
+
+    Equivalent to calling `format_polygon_option_symbol` per strike, but the
+    ticker and date are validated once and the strikes are scaled in one
+    vectorized step.
+
+    Args:
+        underlying_ticker (str): The stock ticker (e.g., "AAPL"). Must be non-empty.
+        expiration_date_str (str): Expiration date in "YYMMDD" format. Must be a 6-digit string.
+        option_types (Union[str, Sequence[str]]): 'C' or 'P' for every strike, or one
+                                                  type per strike. Case-insensitive.
+        strike_prices (ArrayLike): A 1D array of strike prices. All must be positive and finite.
+
+    Returns:
+        List[str]: The formatted Polygon.io option symbols, in strike order.
+
+    Raises:
+        ValueError: If any input parameters are invalid.
+    """
+    ticker = underlying_ticker.strip()
+    if not ticker:
+        raise ValueError("Underlying ticker must be a non-empty string.")
+
+    if _EXPIRATION_DATE_MATCH(expiration_date_str) is None:
+        raise ValueError(f"Expiration date string must be 6 digits (YYMMDD), got: '{expiration_date_str}'")
+
+    strikes = np.asarray(strike_prices, dtype=np.float64)
+    if strikes.ndim != 1:
+        raise ValueError("Strike prices must be a 1D array.")
+    invalid_strikes = ~(np.isfinite(strikes) & (strikes > 0)) # NaN and +inf would scale to garbage int64 strikes
+    if invalid_strikes.any():
+        raise ValueError(f"Strike price must be a positive number, got: {strikes[invalid_strikes][0]}")
+
+    # Round rather than truncate, as in format_polygon_option_symbol (rint also rounds half to even)
+    scaled_strikes = np.rint(strikes * 1000).astype(np.int64).tolist()
+    prefix = f"O:{ticker.upper()}{expiration_date_str}"
+
+    if isinstance(option_types, str):
+        processed_option_type = _OPTION_TYPE_CODES.get(option_types)
+        if processed_option_type is None:
+            raise ValueError(f"Option type must be 'C' or 'P', got: '{option_types}'")
+        return [_OPTION_SYMBOL_SUFFIX_FORMAT % (prefix, processed_option_type, k) for k in scaled_strikes]
+
+    if len(option_types) != len(scaled_strikes):
+        raise ValueError(f"Got {len(option_types)} option types for {len(scaled_strikes)} strikes.")
+    processed_option_types = [_OPTION_TYPE_CODES.get(t) for t in option_types]
+    if None in processed_option_types:
+        bad_type = option_types[processed_option_types.index(None)]
+        raise ValueError(f"Option type must be 'C' or 'P', got: '{bad_type}'")
+    return [_OPTION_SYMBOL_SUFFIX_FORMAT % (prefix, t, k) for t, k in zip(processed_option_types, scaled_strikes)]
 
 
 def format_polygon_ticker(symbol: str, asset_class: str = 'stocks') -> str:
@@ -56,20 +135,11 @@ def format_polygon_ticker(symbol: str, asset_class: str = 'stocks') -> str:
     Returns:
         str: The formatted ticker string (e.g., "I:SPX").
     """
-    prefix_map = {
-        'stocks': '',
-        'indices': 'I:',
-        'crypto': 'X:', # Crypto uses 'X:' prefix
-        'forex': 'C:'   # Forex uses 'C:' prefix
-    }
-    
-    # FIX: More direct logic that avoids the impossible "is None" check.
-    asset_class_lower = asset_class.lower()
-    if asset_class_lower not in prefix_map:
-        raise ValueError(f"Invalid asset class '{asset_class}'. Must be one of {list(prefix_map.keys())}")
+    prefix = _TICKER_PREFIXES.get(asset_class.lower())
+    if prefix is None:
+        raise ValueError(f"Invalid asset class '{asset_class}'. Must be one of {list(_TICKER_PREFIXES)}")
 
-    prefix = prefix_map[asset_class_lower]
-    return f"{prefix}{symbol.upper()}"
+    return prefix + symbol.upper()
 
 
 def to_polygon_date_str(dt_object: Union[datetime.datetime, datetime.date]) -> str:
@@ -83,13 +153,17 @@ def to_polygon_date_str(dt_object: Union[datetime.datetime, datetime.date]) -> s
     Returns:
         str: The formatted date string.
     """
-    return dt_object.strftime('%Y-%m-%d')
+    # isoformat() writes YYYY-MM-DD directly instead of interpreting a strftime format string
+    if isinstance(dt_object, datetime.datetime):
+        dt_object = dt_object.date()
+    return dt_object.isoformat()
 
 
 def to_polygon_nanosecond_timestamp(dt_object: datetime.datetime) -> int:
     """
     Converts a datetime object to a nanosecond integer timestamp as required
-    by some Polygon API endpoints.
+    by some Polygon API endpoints. Naive datetimes are interpreted as local
+    time, as with `datetime.timestamp()`.
 
     Args:
         dt_object (datetime.datetime): The datetime object to convert.
@@ -97,4 +171,30 @@ def to_polygon_nanosecond_timestamp(dt_object: datetime.datetime) -> int:
     Returns:
         int: The timestamp in nanoseconds.
     """
-    return int(dt_object.timestamp() * 1e9)
\ No newline at end of file
+    if dt_object.tzinfo is None:
+        dt_object = dt_object.astimezone()
+    # Integer timedelta arithmetic is exact; timestamp() * 1e9 loses sub-microsecond precision
+    delta = dt_object - _EPOCH
+    return (delta.days * _SECONDS_PER_DAY + delta.seconds) * _NS_PER_SECOND + delta.microseconds * 1_000
+
+
+def to_polygon_nanosecond_timestamps(dt_array: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `to_polygon_nanosecond_timestamp` for NumPy datetime64 arrays,
+    which are already UTC epoch offsets. datetime64[ns] input is reinterpreted
+    as int64 without copying (the result shares its memory); other units are
+    converted to nanoseconds first, which allocates one new array.
+
+    Args:
+        dt_array (np.ndarray): An array of datetime64 values.
+
+    Returns:
+        np.ndarray: An int64 array of timestamps in nanoseconds.
+
+    Raises:
+        ValueError: If the array contains NaT, which would otherwise become INT64_MIN.
+    """
+    nanoseconds = dt_array.astype("datetime64[ns]", copy=False)
+    if np.isnat(nanoseconds).any():
+        raise ValueError("Timestamps must not contain NaT.")
+    return nanoseconds.view(np.int64)